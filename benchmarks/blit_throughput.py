@@ -0,0 +1,49 @@
+"""Blit throughput of the game sprites: file pixel format, display format and the sprite atlas
+
+Run from the project root: python -m benchmarks.blit_throughput
+"""
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from scripts.settings import settings
+
+
+def blits_per_second(screen, blit, names, rounds=200):
+    positions = [((i * 37) % (settings.width - 100), (i * 53) % (settings.height - 100)) for i in range(len(names))]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for name, pos in zip(names, positions):
+            blit(screen, name, pos)
+    return rounds * len(names) / (time.perf_counter() - start)
+
+
+def main():
+    settings.init_display()
+    from scripts.constants import build_sprite_atlas, resource_manager
+
+    build_sprite_atlas()
+    keys = list(resource_manager.atlas_images)
+    screen = settings.screen
+
+    # The same sprites as loaded before: file pixel format, scaled without conversion
+    file_format = {}
+    for name, size, smooth in keys:
+        image = pygame.image.load(os.path.join(resource_manager.images_dir, name))
+        file_format[(name, size, smooth)] = pygame.transform.scale(image, size)
+    display_format = {key: image.copy() for key, image in resource_manager.atlas_images.items()}
+
+    results = [
+        ("file format", blits_per_second(screen, lambda s, key, pos: s.blit(file_format[key], pos), keys)),
+        ("display format", blits_per_second(screen, lambda s, key, pos: s.blit(display_format[key], pos), keys)),
+        ("atlas", blits_per_second(screen, resource_manager.atlas.blit, keys))
+    ]
+    for title, speed in results:
+        print(f"{title:>15}: {speed:>10.0f} blits/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""End of turn economy for 10 to 100 000 planets: the attribute loop against the same loop through the dictionary
+interface of the cells
+
+Run from the project root: python -m benchmarks.economy
+"""
+import random
+
+from benchmarks.save_format import best_time
+from scripts.constants import planet_types
+from scripts.economy import resolve_turn
+from scripts.hexCell import HexCell
+from scripts.saveFormat import specializations
+
+
+def make_planets(count, seed=0):
+    rng = random.Random(seed)
+    planets = []
+    for i in range(count):
+        planet_hex = HexCell(i, 0, 2, 0.0, 0.0)
+        planet_hex.planet_type = rng.choice(list(planet_types))
+        planet_hex.specialization = rng.choice(specializations)
+        planet_hex.is_planet_active = True
+        planet_hex.population = rng.choice([900, 1000, 1100, 1200, 1300])
+        planet_hex.production = 100
+        planet_hex.fuel = 100
+        planets.append(planet_hex)
+    return planets
+
+
+def resolve_turn_by_planet(planets, max_population=3000, fuel_rate=2):
+    """The same turn written as a loop over planets through the dictionary interface"""
+    for planet_hex in planets:
+        planet_type = planet_types[planet_hex["planet_type"]]
+        specialization = planet_hex["specialization"]
+        population = planet_hex["population"]
+        growth = population * planet_type['population_growth_rate'] * (2 if specialization == "population" else 1)
+        planet_hex["population"] = min(max(population, max_population), population + growth // 100)
+        planet_hex["production"] += (population // 100 * planet_type['production_bonus'] *
+                                     (2 if specialization == "production" else 1))
+        planet_hex["fuel"] += population // 100 * fuel_rate * (2 if specialization == "fuel" else 1)
+
+
+def main(counts=(10, 100, 1000, 10000, 100000)):
+    """Prints the time of one turn in ms, both loops run the same number of turns on equal planets"""
+    print(f"{'planets':>8} {'attributes ms':>14} {'keys ms':>9}")
+    for count in counts:
+        planets = make_planets(count)
+        keyed_planets = make_planets(count)
+        attributes_time, _ = best_time(lambda: resolve_turn(planets, planet_types, 3000, 2))
+        keys_time, _ = best_time(lambda: resolve_turn_by_planet(keyed_planets))
+        if [planet_hex.to_dict() for planet_hex in planets] != [planet_hex.to_dict() for planet_hex in keyed_planets]:
+            raise AssertionError(f"The loops give different planets for {count} planets")
+        print(f"{count:>8} {attributes_time * 1000:>14.3f} {keys_time * 1000:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
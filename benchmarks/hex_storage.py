@@ -0,0 +1,75 @@
+"""Memory and iteration cost of the map cells: old dictionaries against HexCell records
+
+Run from the project root: python -m benchmarks.hex_storage
+"""
+import time
+import tracemalloc
+
+from scripts.hexCell import HexCell
+
+
+def make_dict_map(radius):
+    hex_map = []
+    for map_q in range(-radius, radius + 1):
+        for map_r in range(max(-radius, -map_q - radius), min(radius, -map_q + radius) + 1):
+            hex_map.append({"q": map_q, "r": map_r, "value": 0, "x": map_q * 60.6 + map_r * 30.3, "y": map_r * 52.5})
+    return hex_map
+
+
+def make_cell_map(radius):
+    hex_map = []
+    for map_q in range(-radius, radius + 1):
+        for map_r in range(max(-radius, -map_q - radius), min(radius, -map_q + radius) + 1):
+            hex_map.append(HexCell(map_q, map_r, 0, map_q * 60.6 + map_r * 30.3, map_r * 52.5))
+    return hex_map
+
+
+def measure_memory(make_map, radius):
+    tracemalloc.start()
+    hex_map = make_map(radius)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return hex_map, size
+
+
+def read_items(hex_map):
+    total = 0
+    for one_hex in hex_map:
+        if one_hex["value"] == 0:
+            total += one_hex["x"] + one_hex["y"]
+    return total
+
+
+def read_attributes(hex_map):
+    total = 0
+    for one_hex in hex_map:
+        if one_hex.value == 0:
+            total += one_hex.x + one_hex.y
+    return total
+
+
+def measure_iteration(read, hex_map, repeat=5):
+    """Best time of one pass reading value, x and y of every cell"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read(hex_map)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(radii=(6, 25, 50, 100, 200)):
+    """Prints memory in MB and iteration time in ms: dictionaries, cells read as dictionaries, cell attributes"""
+    print(f"{'radius':>6} {'cells':>8} {'dict MB':>9} {'cell MB':>9} {'dict ms':>9} {'cell[] ms':>10} {'cell. ms':>9}")
+    for radius in radii:
+        dict_map, dict_size = measure_memory(make_dict_map, radius)
+        cell_map, cell_size = measure_memory(make_cell_map, radius)
+        dict_time = measure_iteration(read_items, dict_map)
+        cell_item_time = measure_iteration(read_items, cell_map)
+        cell_attribute_time = measure_iteration(read_attributes, cell_map)
+        print(f"{radius:>6} {len(cell_map):>8} {dict_size / 2 ** 20:>9.2f} {cell_size / 2 ** 20:>9.2f} "
+              f"{dict_time * 1000:>9.2f} {cell_item_time * 1000:>10.2f} {cell_attribute_time * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
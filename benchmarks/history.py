@@ -0,0 +1,60 @@
+"""Memory of the undo history over a whole game against deep copies of the map after every command
+
+The game is the seeded random session of benchmarks.replay, played to the last turn. Memory is the Python
+allocations measured by tracemalloc, the first snapshot (the whole map) is counted separately.
+
+Run from the project root: python -m benchmarks.history
+"""
+import copy
+import time
+import tracemalloc
+
+from benchmarks.replay import RADII, record_session
+from scripts.stateHistory import StateHistory
+
+
+def traced_size(function):
+    """Returns the result of function() and the memory it allocated and kept"""
+    tracemalloc.start()
+    result = function()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    print(f"{'radius':>8}{'commands':>10}{'turns':>7}{'first KB':>10}{'history KB':>12}{'per command KB':>16}"
+          f"{'deep copies KB':>16}{'command us':>12}{'rewind ms':>11}")
+    for radius in RADII:
+        command_log = record_session(radius)
+        state = command_log.create_state()
+        history, first_size = traced_size(lambda: StateHistory(state))
+
+        # Snapshots of every command, captured by the state while the commands are applied.
+        # The routes cached by the replay are not a part of the history
+        _, history_size = traced_size(lambda: command_log.replay(state).distance_fields.clear())
+        turns = state.turn_count
+
+        # The same game without tracing, the command time includes the command itself
+        timed_state = command_log.create_state()
+        StateHistory(timed_state)
+        start = time.perf_counter()
+        command_log.replay(timed_state)
+        command_time = (time.perf_counter() - start) / len(command_log.commands)
+
+        # One deep copy of the map stands for each of the snapshots
+        _, copy_size = traced_size(lambda: copy.deepcopy(state.hex_map))
+        copies_size = copy_size * len(history.snapshots)
+
+        start = time.perf_counter()
+        history.rewind(0)
+        rewind_time = time.perf_counter() - start
+
+        count = len(command_log.commands)
+        print(f"{radius:>8}{count:>10}{turns:>7}{first_size / 1024:>10.1f}{history_size / 1024:>12.1f}"
+              f"{history_size / count / 1024:>16.2f}{copies_size / 1024:>16.0f}{command_time * 1e6:>12.1f}"
+              f"{rewind_time * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
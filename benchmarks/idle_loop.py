@@ -0,0 +1,32 @@
+"""Idle cost: CPU usage and wakeups per second of the start screen after loading, nobody touching the game
+
+The dummy video driver cannot block, so SDL polls inside pygame.event.wait and the idle CPU usage here stays
+around a percent; with a real window driver (x11, wayland, windows, cocoa) the process really sleeps.
+
+Run from the project root: python -m benchmarks.idle_loop
+"""
+import os
+import subprocess
+import sys
+
+
+def measure_idle(seconds=5, fixed_rate=False):
+    """Returns (CPU usage of one core from 0 to 1, wakeups per second) of main.py left idle for seconds"""
+    environment = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", NOVA_IDLE_BENCHMARK=str(seconds),
+                       PYGAME_HIDE_SUPPORT_PROMPT="1")
+    if fixed_rate:
+        environment["NOVA_FIXED_RATE"] = "1"
+    result = subprocess.run([sys.executable, "main.py"], env=environment, capture_output=True, text=True,
+                            check=True)
+    stats = dict(line.split() for line in result.stdout.splitlines() if " " in line)
+    return float(stats["cpu_usage"]), float(stats["wakeups_per_second"])
+
+
+def main(seconds=5):
+    for name, fixed_rate in (("fixed rate", True), ("idle loop", False)):
+        cpu_usage, wakeups = measure_idle(seconds, fixed_rate)
+        print(f"{name:<10}: CPU {cpu_usage * 100:5.1f}%, {wakeups:6.1f} wakeups/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Replays of recorded sessions as a repeatable workload: commands per second and the jump to a turn
+
+A seeded random player records a whole game on every map radius, the recording is then played again headless.
+
+Run from the project root: python -m benchmarks.replay
+"""
+import random
+
+from benchmarks.save_format import best_time
+from scripts.commandLog import CommandLog
+from scripts.gameState import GameState
+from scripts.settings import settings
+
+SEED = 2024
+RADII = (6, 25, 50)
+resources = ("population", "production", "fuel")
+
+
+def record_session(radius, seed=SEED):
+    """Plays a game with random moves, transfers and specializations and returns its command log"""
+    rng = random.Random(seed)
+    center_cords = (settings.width // 2, settings.height // 2)
+    state = GameState.generate(center_cords, radius, seed)
+    command_log = CommandLog.start(state, radius, center_cords)
+    while not state.game_over:
+        for spaceship_hex in list(state.entities.get_all('spaceship')):
+            # A spaceship without fuel ends the game, the player keeps some
+            distance_field = state.get_distance_field(spaceship_hex)
+            movement_area = [one_hex for one_hex in state.get_movement_area(spaceship_hex)
+                             if distance_field.get_cost((one_hex["q"], one_hex["r"])) < spaceship_hex["fuel"] // 2]
+            if movement_area:
+                target_hex = rng.choice(movement_area)
+                state.apply(("move", (spaceship_hex["q"], spaceship_hex["r"]), (target_hex["q"], target_hex["r"])))
+
+        for planet_hex in state.entities.get_all('planet'):
+            if not state.is_next_to_spaceship(planet_hex):
+                continue
+            planet_cords = (planet_hex["q"], planet_hex["r"])
+            state.apply(("specialize", planet_cords, rng.choice(resources)))
+            resource = rng.choice(resources)
+            amount = state.get_transfer_amount(planet_hex, resource)
+            if amount:
+                state.apply(("transfer", planet_cords, resource, amount))
+        state.apply(("end_turn",))
+    state.recorder = None
+    return command_log
+
+
+def main():
+    print(f"{'radius':>8}{'commands':>10}{'turns':>7}{'replay ms':>12}{'commands/s':>12}{'to turn 25 ms':>15}")
+    for radius in RADII:
+        command_log = record_session(radius)
+        # The log goes through JSON like a saved session
+        command_log = CommandLog.from_dict(command_log.to_dict())
+        count = len(command_log.commands)
+        replay_time, state = best_time(command_log.replay)
+        jump_time = best_time(lambda: command_log.fast_forward(25))[0]
+        turns = state.turn_count
+        print(f"{radius:>8}{count:>10}{turns:>7}{replay_time * 1000:>12.2f}{count / replay_time:>12.0f}"
+              f"{jump_time * 1000:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Save and load time and size: old pretty-printed JSON against the binary save format
+
+Run from the project root: python -m benchmarks.save_format
+"""
+import io
+import random
+import time
+
+from benchmarks.hex_storage import make_cell_map
+from scripts.saveFormat import encode_map, decode_map, import_json_map
+from scripts.saveWriter import encode_json
+
+
+def make_snapshot(radius, seed=0):
+    """A map with a planet on every 40th cell, one spaceship and one transport"""
+    rng = random.Random(seed)
+    hex_map = make_cell_map(radius)
+    for one_hex in hex_map[::40]:
+        one_hex.value = 2
+        one_hex.planet_type = rng.choice(['tropical', 'ocean', 'cloudy', 'snowy', 'muddy', 'lunar'])
+        one_hex.specialization = None
+        one_hex.is_planet_active = True
+        one_hex.population = rng.choice([900, 1000, 1100])
+        one_hex.fuel = rng.choice([0, 50, 100])
+        one_hex.production = rng.choice([0, 50, 100])
+    hex_map[1].value, hex_map[1].fuel, hex_map[1].population, hex_map[1].production = 3, 100, 0, 0
+    hex_map[2].value, hex_map[2].population = 4, 0
+    return seed, [one_hex.to_dict() for one_hex in hex_map]
+
+
+def best_time(function, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(radii=(6, 25, 50, 100)):
+    """Prints encode and decode time in ms and the size in KB of both formats"""
+    print(f"{'radius':>6} {'cells':>8} {'json KB':>9} {'bin KB':>9} {'json save':>10} {'bin save':>9} "
+          f"{'json load':>10} {'bin load':>9}")
+    for radius in radii:
+        snapshot = make_snapshot(radius)
+        json_save_time, json_data = best_time(lambda: encode_json(snapshot[1]))
+        binary_save_time, binary_data = best_time(lambda: encode_map(snapshot))
+        json_load_time, _ = best_time(lambda: import_json_map(io.BytesIO(json_data)))
+        binary_load_time, _ = best_time(lambda: decode_map(binary_data))
+        print(f"{radius:>6} {len(snapshot[1]):>8} {len(json_data) / 1024:>9.1f} {len(binary_data) / 1024:>9.1f} "
+              f"{json_save_time * 1000:>10.2f} {binary_save_time * 1000:>9.2f} "
+              f"{json_load_time * 1000:>10.2f} {binary_load_time * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Cold start: time from importing main.py to the first flip() of the start screen
+
+Run from the project root: python -m benchmarks.startup
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+def measure_startup(runs=5):
+    """Returns lists of in-game startup times and whole process times in seconds"""
+    environment = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", NOVA_STARTUP_BENCHMARK="1",
+                       PYGAME_HIDE_SUPPORT_PROMPT="1")
+    startup_times = []
+    process_times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "main.py"], env=environment, capture_output=True, text=True,
+                                check=True)
+        process_times.append(time.perf_counter() - start)
+        for line in result.stdout.splitlines():
+            if line.startswith("startup_time"):
+                startup_times.append(float(line.split()[1]))
+    return startup_times, process_times
+
+
+def main(runs=5):
+    startup_times, process_times = measure_startup(runs)
+    print(f"import to first flip: min {min(startup_times) * 1000:.1f} ms, "
+          f"median {statistics.median(startup_times) * 1000:.1f} ms")
+    print(f"whole process:        min {min(process_times) * 1000:.1f} ms, "
+          f"median {statistics.median(process_times) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
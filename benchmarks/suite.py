@@ -0,0 +1,199 @@
+"""Map generation, picking, routes, drawing, turns and saves over map radii, compared with a stored baseline
+
+Runs under the SDL dummy video driver with fixed seeds. Times are the best of several runs, peak memory is
+the Python allocations of one run measured by tracemalloc (pygame surfaces are not counted).
+
+The map center is in the screen center, drawing only visits the hexagons the camera sees.
+
+Run from the project root: python -m benchmarks.suite
+    --radii 6 25 50       map radii to measure
+    --update-baseline     store the results as the new baseline
+    --threshold 1.5       report operations slower than baseline * threshold...
+    --min-delta 0.05      ...and by more than this many milliseconds, so timer noise of tiny operations is ignored
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from scripts.constants import build_sprite_atlas
+from scripts.hexmap import HexMap
+from scripts.mapGenerator import generate_hex_map
+from scripts.saveWriter import save_writer
+from scripts.settings import settings
+from scripts.turnManager import TurnManager
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SEED = 2024
+CLICKS = 1000
+
+
+def measure(function, setup=None, teardown=None, repeat=7):
+    """Returns the best time in seconds and the peak traced memory in bytes of function()
+
+    Like timeit, the garbage collector is off while timing, its pauses are the main noise of big maps"""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+        if teardown:
+            teardown()
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    if teardown:
+        teardown()
+    return best, peak
+
+
+def benchmark_radius(radius):
+    """Returns {operation: (seconds, peak bytes)} for one map radius"""
+    results = {}
+    center_cords = (settings.width // 2, settings.height // 2)
+    results["generate"] = measure(lambda: generate_hex_map(center_cords, radius, SEED))
+    hex_map = HexMap(center_cords, radius, saved_map=(generate_hex_map(center_cords, radius, SEED), SEED))
+    turn_manager = TurnManager(hex_map.state)
+    save_writer.flush()
+
+    # Picking: fixed screen points, one click each with the selection reset between clicks
+    rng = random.Random(SEED)
+    positions = [(rng.randrange(settings.width), rng.randrange(settings.height)) for _ in range(CLICKS)]
+
+    def click_all():
+        for pos in positions:
+            hex_map.get_clicked_hex(pos)
+            hex_map.deselect_all()
+
+    seconds, peak = measure(click_all, teardown=save_writer.flush)
+    results["pick"] = (seconds / CLICKS, peak)
+
+    # Drawing: the whole map with the static layer, and only the overlays on top of it
+    results["draw_full"] = measure(lambda: hex_map.draw(settings.screen, turn_manager),
+                                   setup=hex_map.invalidate_static_layer)
+
+    def request_redraw():
+        hex_map.needs_redraw = True
+
+    results["draw_overlay"] = measure(lambda: hex_map.draw(settings.screen, turn_manager), setup=request_redraw)
+
+    # Routes: the distance field of the spaceship from scratch, then hovering over hexagons with it cached
+    spaceship_hex = hex_map.entities.get_all('spaceship')[0]
+
+    def clear_distance_fields():
+        hex_map.state.distance_fields.clear()
+
+    results["distance_field"] = measure(lambda: hex_map.state.get_distance_field(spaceship_hex),
+                                        setup=clear_distance_fields)
+
+    def select_spaceship():
+        hex_map.select_spaceship(spaceship_hex)
+
+    def hover_all():
+        for pos in positions:
+            hex_map.hover(pos)
+
+    seconds, peak = measure(hover_all, setup=select_spaceship, teardown=hex_map.deselect_all)
+    results["hover"] = (seconds / CLICKS, peak)
+
+    # A turn: the state changes and the save snapshot is handed to the writer
+    end_turn_event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, mod=0, unicode=" ", scancode=0)
+
+    def reset_turns():
+        hex_map.state.turn_count = 0
+        hex_map.state.game_over = False
+
+    results["turn"] = measure(lambda: turn_manager.handle_input(end_turn_event, hex_map), setup=reset_turns,
+                              teardown=save_writer.flush)
+
+    # A save until it is on disk
+    def save():
+        hex_map.save_map()
+        save_writer.flush()
+
+    results["save"] = measure(save)
+    return results
+
+
+def run(radii):
+    return {str(radius): {name: {"time_ms": round(seconds * 1000, 4), "peak_kb": round(peak / 1024, 1)}
+                          for name, (seconds, peak) in benchmark_radius(radius).items()}
+            for radius in radii}
+
+
+def compare(results, baseline, threshold, min_delta):
+    """Prints every operation with its change against the baseline, returns the list of regressions"""
+    regressions = []
+    print(f"{'radius':>6} {'operation':<15} {'time ms':>10} {'peak KB':>10} {'baseline ms':>12} {'change':>8}")
+    for radius, operations in results.items():
+        for name, result in operations.items():
+            base = baseline.get(radius, {}).get(name)
+            line = f"{radius:>6} {name:<15} {result['time_ms']:>10.3f} {result['peak_kb']:>10.1f}"
+            if base:
+                ratio = result["time_ms"] / base["time_ms"] if base["time_ms"] else 1
+                line += f" {base['time_ms']:>12.3f} {ratio:>7.2f}x"
+                if ratio > threshold and result["time_ms"] - base["time_ms"] > min_delta:
+                    line += "  REGRESSION"
+                    regressions.append((radius, name, ratio))
+            print(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Nova Eclipse benchmark suite")
+    parser.add_argument("--radii", type=int, nargs="+", default=[6, 12, 25, 50, 100])
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=1.5)
+    parser.add_argument("--min-delta", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    settings.init_display()
+    build_sprite_atlas()
+
+    # Saves go to a temporary directory, the real save is not touched
+    with tempfile.TemporaryDirectory(prefix="nova_benchmark_") as save_dir:
+        settings.save_dir = save_dir
+        try:
+            results = run(args.radii)
+        finally:
+            # Nothing may still be writing into the directory when it is removed
+            save_writer.flush()
+    baseline = {}
+    if os.path.isfile(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as file:
+            baseline = json.load(file)
+    regressions = compare(results, baseline, args.threshold, args.min_delta)
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as file:
+            json.dump(baseline, file, indent=4)
+        print(f"Baseline saved to {BASELINE_PATH}")
+    elif regressions:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,93 +1,195 @@
+import time
+
+# Start of the cold start measurement, before anything heavy is imported
+import_time = time.perf_counter()
+
+import os
 import pygame
 import sys
 
 from scripts import hexmap
 from scripts import turnManager
-from scripts.resourceManager import ResourceManager
+from scripts.autoPlayer import AutoPlayer
+from scripts.constants import (build_sprite_atlas, get_image, get_scaled_image, image_manifest, render_text,
+                               resource_manager)
+from scripts.fixedTimestep import FixedTimestep
+from scripts.frameProfiler import profiler
+from scripts.idleClock import expose_events
+from scripts.preloader import Preloader
+from scripts.saveWriter import save_writer
 from scripts.settings import settings
 
 
-resource_manager = ResourceManager(settings.images_dir)
+def report_startup_time():
+    """Prints the time from import to the first flip() when NOVA_STARTUP_BENCHMARK is set and exits"""
+    if os.environ.get("NOVA_STARTUP_BENCHMARK"):
+        print(f"startup_time {time.perf_counter() - import_time:.6f}")
+        terminate()
+
 
+def report_idle_stats():
+    """Prints CPU usage and wakeups per second of an idle screen and exits,
+    when NOVA_IDLE_BENCHMARK is set to the number of seconds to measure"""
+    seconds = os.environ.get("NOVA_IDLE_BENCHMARK")
+    if seconds and time.perf_counter() - settings.clock.stats_time >= float(seconds):
+        cpu_usage, wakeups = settings.clock.get_stats()
+        print(f"cpu_usage {cpu_usage:.4f}")
+        print(f"wakeups_per_second {wakeups:.2f}")
+        terminate()
 
-def start_screen():
-    """Display start menu"""
-    title_font = pygame.font.Font(None, 72)
-    button_font = pygame.font.Font(None, 36)
 
-    title_text = title_font.render("Nova Eclipse", True, settings.colors['white'])
+def start_screen(preloader=None):
+    """Display start menu, the game images are decoded by the preloader meanwhile"""
+    title_text = render_text("Nova Eclipse", settings.colors['white'], settings.title_font_size)
     title_rect = title_text.get_rect(center=(settings.width // 2, settings.height // 3))
 
-    start_button_text = button_font.render("Начать", True, settings.colors['black'])
+    start_button_text = render_text("Начать", settings.colors['black'], settings.button_font_size)
     start_button_rect = start_button_text.get_rect(center=(settings.width // 2, settings.height // 2))
     start_button_cords = pygame.Rect(start_button_rect.left - 10, start_button_rect.top - 5,
                                      start_button_rect.width + 20, start_button_rect.height + 10)
+    progress_bar_rect = pygame.Rect(0, 0, settings.progress_bar_width, settings.progress_bar_height)
+    progress_bar_rect.midtop = (settings.width // 2, start_button_cords.bottom + settings.menu_padding * 2)
 
-    background = pygame.transform.scale(resource_manager.load_image("cosmos.jpg"), (settings.width, settings.height))
+    background = get_scaled_image('background', (settings.width, settings.height))
+
+    # The screen is drawn again only when the loading progress changes or the window is exposed
+    drawn_progress = None
     while True:
-        settings.screen.blit(background, (0, 0))
-        for event in pygame.event.get():
+        loading = preloader is not None and not preloader.ready.done()
+        progress = preloader.progress if loading else 1
+        for event in settings.clock.get_events(animating=loading):
             if event.type == pygame.QUIT:
                 terminate()
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if start_button_cords.collidepoint(event.pos):
                     return
+            elif event.type in expose_events:
+                drawn_progress = None
+
+        if progress == drawn_progress:
+            report_idle_stats()
+            continue
+        if progress == 1:
+            # The idle period starts after the loading
+            settings.clock.reset_stats()
 
+        settings.screen.blit(background, (0, 0))
         settings.screen.blit(title_text, title_rect)
 
         pygame.draw.rect(settings.screen, settings.colors['white'], start_button_cords)
         settings.screen.blit(start_button_text, start_button_rect)
 
+        # Loading progress
+        if loading:
+            pygame.draw.rect(settings.screen, settings.colors['grey'], progress_bar_rect, 1)
+            loaded_rect = progress_bar_rect.copy()
+            loaded_rect.width = int(progress_bar_rect.width * preloader.progress)
+            pygame.draw.rect(settings.screen, settings.colors['white'], loaded_rect)
+
         pygame.display.flip()
-        settings.clock.tick(settings.fps)
+        drawn_progress = progress
+        report_startup_time()
 
 
 def game():
     """Display main game"""
-    turn_manager = turnManager.TurnManager()
-    hex_map = hexmap.HexMap((settings.width // 2, settings.height // 2), settings.map_radius)
-    background = pygame.transform.scale(resource_manager.load_image("cosmos.jpg"), (settings.width, settings.height))
+    background = get_scaled_image('background', (settings.width, settings.height))
+    hex_map = hexmap.HexMap((settings.width // 2, settings.height // 2), settings.map_radius, background)
+    turn_manager = turnManager.TurnManager(hex_map.state)
+    timestep = FixedTimestep(settings.simulation_rate, settings.max_catch_up_steps)
+    # The computer player thinks in other processes, its command is used only if the state is still the same
+    auto_player = AutoPlayer()
+    searched_snapshot = None
 
     while not turn_manager.game_over:
-        settings.screen.blit(background, (0, 0))
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                terminate()
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                hex_map.get_clicked_hex(event.pos)
-
-            turn_manager.handle_input(event, hex_map)
-
-        hex_map.draw(settings.screen, turn_manager)
-        turn_manager.draw_turn_button(settings.screen)
-        pygame.display.flip()
-        settings.clock.tick(settings.fps)
+        # Without animations on the map or the computer player the loop sleeps until input
+        events = settings.clock.get_events(animating=hex_map.is_animating() or settings.ai_player)
+
+        # Waiting is not a part of the frame
+        profiler.begin_frame()
+        with profiler.scope("events"):
+            for event in events:
+                if event.type == pygame.QUIT:
+                    terminate()
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    hex_map.get_clicked_hex(event.pos)
+                elif event.type == pygame.MOUSEMOTION:
+                    hex_map.hover(event.pos)
+                elif event.type in expose_events:
+                    hex_map.invalidate_static_layer()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    # The overlay covers the map, the whole map is drawn again after hiding it
+                    profiler.toggle()
+                    hex_map.invalidate_static_layer()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_z and event.mod & pygame.KMOD_CTRL:
+                    hex_map.undo()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_BACKSPACE:
+                    hex_map.rewind()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                    settings.ai_player = not settings.ai_player
+                    auto_player.cancel()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4 and profiler.samples:
+                    profiler.export_csv(settings.profile_path)
+                    print(f"Профиль кадров сохранён в '{settings.profile_path}'")
+
+                hex_map.handle_camera_input(event)
+                turn_manager.handle_input(event, hex_map)
+
+        # The computer player moves after the previous animation, one command at a time
+        if settings.ai_player and not hex_map.is_animating():
+            with profiler.scope("ai_player"):
+                if auto_player.thinking and hex_map.history.snapshots[-1] is not searched_snapshot:
+                    # The player changed the state meanwhile, the search is for a state that is gone
+                    auto_player.cancel()
+                if not auto_player.thinking:
+                    if auto_player.request(hex_map.state):
+                        searched_snapshot = hex_map.history.snapshots[-1]
+                else:
+                    command = auto_player.poll()
+                    if command is not None:
+                        hex_map.apply_command(command)
+
+        # Update: fixed simulation steps for the time since the previous frame
+        with profiler.scope("simulate"):
+            alpha = timestep.advance(hex_map.simulate, active=hex_map.is_animating())
+
+        # Render: only the changed parts of the screen are sent to the display
+        dirty_rects = hex_map.draw(settings.screen, turn_manager, alpha)
+        if profiler.overlay_visible:
+            with profiler.scope("overlay"):
+                dirty_rects.append(profiler.draw_overlay(
+                    settings.screen, resource_manager.load_font(None, settings.profiler_font_size),
+                    (settings.indent, settings.info_bar_height + settings.indent),
+                    settings.colors['white'], settings.colors['black']))
+        with profiler.scope("display_update"):
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+        profiler.end_frame()
+    auto_player.shutdown()
     return
 
 
 def end_screen():
     """Display end menu"""
-    title_font = pygame.font.Font(None, 72)
-    text_font = pygame.font.Font(None, 36)
-
-    title_text = title_font.render("Игра окончена!", True, settings.colors['white'])
+    title_text = render_text("Игра окончена!", settings.colors['white'], settings.title_font_size)
     title_rect = title_text.get_rect(center=(settings.width // 2, settings.height // 3))
 
-    restart_button_text = text_font.render("Играть заново", True, settings.colors['black'])
+    restart_button_text = render_text("Играть заново", settings.colors['black'], settings.button_font_size)
     restart_button_rect = restart_button_text.get_rect(center=(settings.width // 2, settings.height * 2 // 3))
     restart_button_cords = pygame.Rect(restart_button_rect.left - 10, restart_button_rect.top - 5,
                                        restart_button_rect.width + 20, restart_button_rect.height + 10)
 
-    exit_button_text = text_font.render("Выход", True, settings.colors['black'])
+    exit_button_text = render_text("Выход", settings.colors['black'], settings.button_font_size)
     exit_button_rect = exit_button_text.get_rect(center=(settings.width // 2, settings.height * 5 // 6))
     exit_button_cords = pygame.Rect(exit_button_rect.left - 10, exit_button_rect.top - 5,
                                     exit_button_rect.width + 20, exit_button_rect.height + 10)
 
-    background = pygame.transform.scale(resource_manager.load_image("cosmos.jpg"), (settings.width, settings.height))
+    background = get_scaled_image('background', (settings.width, settings.height))
+
+    # The menu is static, it is drawn once and again only when the window is exposed
+    needs_redraw = True
     while True:
-        settings.screen.blit(background, (0, 0))
-        for event in pygame.event.get():
+        for event in settings.clock.get_events():
             if event.type == pygame.QUIT:
                 terminate()
             elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -96,7 +198,13 @@ def end_screen():
                     return
                 elif exit_button_cords.collidepoint(event.pos):
                     terminate()
+            elif event.type in expose_events:
+                needs_redraw = True
 
+        if not needs_redraw:
+            continue
+
+        settings.screen.blit(background, (0, 0))
         settings.screen.blit(title_text, title_rect)
 
         pygame.draw.rect(settings.screen, settings.colors['white'], restart_button_cords)
@@ -106,18 +214,33 @@ def end_screen():
         settings.screen.blit(exit_button_text, exit_button_rect)
 
         pygame.display.flip()
-        settings.clock.tick(settings.fps)
+        needs_redraw = False
 
 
 def terminate():
+    save_writer.flush()
     pygame.quit()
     sys.exit()
 
 
 def main():
-    start_screen()
-    game()
-    end_screen()
+    if os.environ.get("NOVA_FIXED_RATE"):
+        settings.idle_loop = False
+    if os.environ.get("NOVA_AI_PLAYER"):
+        settings.ai_player = True
+    settings.init_display(get_image('icon'))
+    # The start screen only needs the background, everything else is decoded behind it
+    get_image('background')
+    preloader = Preloader(resource_manager, image_manifest.values())
+    start_screen(preloader)
+    preloader.finish()
+    build_sprite_atlas()
+    try:
+        game()
+        end_screen()
+    finally:
+        # The writer thread is a daemon, the last save and log lines are written before the process exits
+        save_writer.flush()
 
 
 if __name__ == "__main__":
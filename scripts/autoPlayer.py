@@ -0,0 +1,236 @@
+"""Computer player: Monte Carlo search over the game rules in worker processes
+
+Every worker gets a copy of the game state and plays random games (rollouts) from it until its time budget runs out.
+The first command of a rollout is chosen by UCB1 among the legal commands, the rest of it is random and a few turns
+long. The results of all workers are summed and the most tried command is played, so more cores give more rollouts
+in the same time. The search runs in processes, the game loop only checks whether they are done and keeps drawing.
+
+Headless soak test from the project root: python -m scripts.autoPlayer --games 5
+    --radius 6          map radius, settings.map_radius by default
+    --seed 0            seed of the first map, every game uses the next one
+    --move-time 0.2     thinking time per command in seconds
+    --workers 4         search processes, every core by default
+"""
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from scripts.gameState import GameState
+from scripts.hexCell import HexCell
+from scripts.settings import settings
+from scripts.stateHistory import StateHistory
+from scripts.utils import hex_neighbor_coords
+
+resources = ("population", "production", "fuel")
+
+# A spaceship without fuel ends the game. Any other state scores at least its fuel, so a lost game is the worst
+# and the scores stay in one range for UCB1
+lost_game_score = 0
+
+
+def encode_state(state):
+    """Returns everything the search needs to rebuild the state in another process"""
+    return ([one_hex.to_dict() for one_hex in state.hex_map], state.seed, tuple(state.entities.entities['spaceship']),
+            tuple(state.moved_spaceships), state.turn_count, state.game_over, state.can_specialize,
+            state.turns_since_last_specialization)
+
+
+def decode_state(data):
+    cells, seed, spaceships, moved_spaceships, turn_count, game_over, can_specialize, turns_since_specialization = data
+    state = GameState([HexCell.from_dict(cell) for cell in cells], seed)
+    # The registry order decides the nearest one of equally distant spaceships, it is kept as it was
+    state.entities.entities['spaceship'] = {tuple(cords): state.hex_index[tuple(cords)] for cords in spaceships}
+    state.moved_spaceships = set(moved_spaceships)
+    state.turn_count = turn_count
+    state.game_over = game_over
+    state.can_specialize = can_specialize
+    state.turns_since_last_specialization = turns_since_specialization
+    return state
+
+
+def get_legal_commands(state):
+    """Returns the useful commands of the state: moves next to planets and the transport, transfers,
+    specializations and visits from the spaceships, and the end of the turn"""
+    commands = [("end_turn",)]
+    targets = {coords for kind in ('planet', 'transport_spaceship') for one_hex in state.entities.get_all(kind)
+               for coords in hex_neighbor_coords(one_hex["q"], one_hex["r"])}
+    for spaceship_hex in state.entities.get_all('spaceship'):
+        if not state.can_move_spaceship(spaceship_hex):
+            continue
+        spaceship_cords = (spaceship_hex["q"], spaceship_hex["r"])
+        for target_hex in state.get_movement_area(spaceship_hex):
+            target_cords = (target_hex["q"], target_hex["r"])
+            if target_cords in targets:
+                commands.append(("move", spaceship_cords, target_cords))
+
+    for planet_hex in state.entities.get_all('planet'):
+        if not state.is_next_to_spaceship(planet_hex):
+            continue
+        planet_cords = (planet_hex["q"], planet_hex["r"])
+        for resource in resources:
+            amount = state.get_transfer_amount(planet_hex, resource)
+            if amount and planet_hex["population"] > 0:
+                commands.append(("transfer", planet_cords, resource, amount))
+            if state.can_specialize and planet_hex["specialization"] != resource:
+                commands.append(("specialize", planet_cords, resource))
+
+    inactive_planets = any(not planet_hex["is_planet_active"] for planet_hex in state.entities.get_all('planet'))
+    for transport_hex in state.entities.get_all('transport_spaceship'):
+        if inactive_planets and state.is_next_to_spaceship(transport_hex):
+            commands.append(("visit_transport", (transport_hex["q"], transport_hex["r"])))
+    return commands
+
+
+def evaluate(state):
+    """Score of a state: everything the spaceships carry, a lost game is the worst"""
+    spaceships = state.entities.get_all('spaceship')
+    if any(spaceship_hex["fuel"] <= 0 for spaceship_hex in spaceships):
+        return lost_game_score
+    return sum(spaceship_hex[resource] for spaceship_hex in spaceships for resource in resources)
+
+
+def rollout(state, rng, turns):
+    """Plays random commands for the given number of turns and returns the score"""
+    end_turn = state.turn_count + turns
+    while not state.game_over and state.turn_count < end_turn:
+        commands = get_legal_commands(state)
+        # Ending the turn is one choice among the others, so a turn has a few commands on average
+        state.apply(rng.choice(commands))
+    return evaluate(state)
+
+
+def search(data, move_time, turns, seed):
+    """Rollouts from the encoded state for move_time seconds, returns {command: (visits, total score)}"""
+    deadline = time.perf_counter() + move_time
+    rng = random.Random(seed)
+    state = decode_state(data)
+    history = StateHistory(state)
+    commands = get_legal_commands(state)
+    visits = [0] * len(commands)
+    totals = [0] * len(commands)
+    lowest = highest = None
+
+    count = 0
+    while count < len(commands) or time.perf_counter() < deadline:
+        if count < len(commands):
+            # Every command is tried once before UCB1 compares them
+            i = count
+        else:
+            # Scores are in resource units, the exploration term is scaled to the scores seen
+            scale = (highest - lowest) or 1
+            i = max(range(len(commands)), key=lambda j: totals[j] / visits[j] +
+                    scale * math.sqrt(2 * math.log(count) / visits[j]))
+        state.apply(commands[i])
+        score = rollout(state, rng, turns)
+        history.restore(0)
+
+        visits[i] += 1
+        totals[i] += score
+        lowest = score if lowest is None else min(lowest, score)
+        highest = score if highest is None else max(highest, score)
+        count += 1
+    return {command: (visits[i], totals[i]) for i, command in enumerate(commands)}
+
+
+class AutoPlayer:
+    """Chooses commands in a pool of search processes without blocking the caller
+
+    request() starts the search of a state, poll() returns the chosen command once every worker is done."""
+    def __init__(self, move_time=None, workers=None, rollout_turns=None):
+        self.move_time = settings.ai_move_time if move_time is None else move_time
+        self.workers = workers or settings.ai_workers or os.cpu_count()
+        self.rollout_turns = rollout_turns or settings.ai_rollout_turns
+        self.executor = None
+        self.futures = []
+        # Searches that were cancelled while running, new ones wait until the workers are free of them
+        self.cancelled_futures = []
+        self.rng = random.Random()
+
+    @property
+    def thinking(self):
+        return bool(self.futures)
+
+    def request(self, state):
+        """Starts searching a command for the state, returns False while cancelled searches still occupy
+        the workers, then the caller asks again later"""
+        self.cancelled_futures = [future for future in self.cancelled_futures if not future.done()]
+        if self.cancelled_futures:
+            return False
+        if self.executor is None:
+            # Spawned workers do not inherit the window of the game
+            self.executor = ProcessPoolExecutor(self.workers, multiprocessing.get_context("spawn"))
+        data = encode_state(state)
+        self.futures = [self.executor.submit(search, data, self.move_time, self.rollout_turns,
+                                             self.rng.randrange(2 ** 32))
+                        for _ in range(self.workers)]
+        return True
+
+    def poll(self):
+        """Returns the chosen command when the search is done, otherwise None"""
+        if not self.futures or not all(future.done() for future in self.futures):
+            return None
+        results = {}
+        for future in self.futures:
+            for command, (visits, total) in future.result().items():
+                command_visits, command_total = results.get(command, (0, 0))
+                results[command] = (command_visits + visits, command_total + total)
+        self.futures = []
+        # The most tried command, its score is the most certain
+        return max(results, key=lambda command: results[command])
+
+    def choose_command(self, state):
+        """Searches a command for the state and waits for it"""
+        for future in self.cancelled_futures:
+            future.exception()
+        self.request(state)
+        for future in self.futures:
+            future.result()
+        return self.poll()
+
+    def cancel(self):
+        """Drops the search, its result is not needed any more. Searches still waiting for a worker
+        never start, the running ones end within move_time and are waited for by the next request"""
+        for future in self.futures:
+            if not future.cancel():
+                self.cancelled_futures.append(future)
+        self.futures = []
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Plays whole games with the computer player")
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--radius", type=int, default=settings.map_radius)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--move-time", type=float, default=0.2)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(args)
+
+    auto_player = AutoPlayer(args.move_time, args.workers)
+    print(f"{'seed':>6}{'commands':>10}{'turns':>7}{'score':>8}{'lost':>6}{'seconds':>9}")
+    for seed in range(args.seed, args.seed + args.games):
+        state = GameState.generate((0, 0), args.radius, seed)
+        start = time.perf_counter()
+        commands = 0
+        while not state.game_over:
+            command = auto_player.choose_command(state)
+            if not state.apply(command):
+                # The search works on the same rules, a refused command is a bug
+                raise RuntimeError(f"The computer player chose an illegal command {command}")
+            commands += 1
+        score = evaluate(state)
+        print(f"{seed:>6}{commands:>10}{state.turn_count:>7}{score:>8}{score == lost_game_score!s:>6}"
+              f"{time.perf_counter() - start:>9.1f}")
+    auto_player.shutdown()
+
+
+if __name__ == "__main__":
+    main()
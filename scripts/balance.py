@@ -0,0 +1,183 @@
+"""Balance statistics of generated maps over many seeds, generated in a pool of processes
+
+Every task generates a range of consecutive seeds and returns only the statistics of its maps, so memory does not
+grow with the number of maps and the same seeds are measured whatever the number of processes is.
+
+Per map:
+    planet_spacing          hexagons between the two closest planets
+    nearest_planet          mean distance from a planet to its closest neighbour
+    largest_population      share of the total population on the most populated planet
+    population_spread       population of the most populated planet minus the least populated one
+    transport_distance      mean distance from the transport spaceship to the planets
+    nearest_transport       distance from the transport spaceship to the closest planet
+    reachable_planets       planets the spaceship can reach next to with its starting fuel
+
+Run from the project root: python -m scripts.balance --maps 100000
+    --radius 6              map radius, settings.map_radius by default
+    --seed 0                first seed, the maps use seeds seed ... seed + maps - 1
+    --workers 4             processes, every core by default
+    --chunk 500             seeds per task
+    --scaling               measure maps per second with 1, 2, 4 ... workers up to --workers
+"""
+import argparse
+import math
+import multiprocessing
+import os
+import time
+
+from scripts.gameState import GameState
+from scripts.mapGenerator import MapGenerationError, generate_hex_map
+from scripts.settings import settings
+from scripts.utils import hex_distance, hex_neighbor_coords
+
+metric_names = ('planet_spacing', 'nearest_planet', 'largest_population', 'population_spread',
+                'transport_distance', 'nearest_transport', 'reachable_planets')
+
+
+class RunningStats:
+    """Count, mean, variance, minimum and maximum of a stream of values without keeping the values
+
+    Welford's update for single values and Chan's formula to merge the statistics of two streams."""
+    __slots__ = ('count', 'mean', 'm2', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0
+        self.m2 = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def merge(self, other):
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0
+
+
+def measure_map(hex_map):
+    """Returns {metric: value} of one generated map"""
+    state = GameState(hex_map)
+    planets = state.entities.get_all('planet')
+    transport_hex = state.entities.get_all('transport_spaceship')[0]
+    spaceship_hex = state.entities.get_all('spaceship')[0]
+
+    nearest = [min(hex_distance(planet_hex, other_hex) for other_hex in planets if other_hex is not planet_hex)
+               for planet_hex in planets]
+    population = [planet_hex["population"] for planet_hex in planets]
+    transport_distances = [hex_distance(transport_hex, planet_hex) for planet_hex in planets]
+
+    # A planet is used from a neighbouring hexagon, the starting fuel decides which ones the spaceship gets to
+    distance_field = state.get_distance_field(spaceship_hex)
+    reachable = sum(any(distance_field.get_cost(coords) is not None
+                        for coords in hex_neighbor_coords(planet_hex["q"], planet_hex["r"]))
+                    for planet_hex in planets)
+
+    return {
+        'planet_spacing': min(nearest),
+        'nearest_planet': sum(nearest) / len(nearest),
+        'largest_population': max(population) / sum(population),
+        'population_spread': max(population) - min(population),
+        'transport_distance': sum(transport_distances) / len(transport_distances),
+        'nearest_transport': min(transport_distances),
+        'reachable_planets': reachable
+    }
+
+
+def measure_seeds(task):
+    """Generates the maps of seeds start ... stop - 1,
+    returns the number of maps, their statistics and the number of maps that could not be generated"""
+    radius, start, stop = task
+    stats = {name: RunningStats() for name in metric_names}
+    failures = 0
+    for seed in range(start, stop):
+        try:
+            hex_map = generate_hex_map((0, 0), radius, seed)
+        except MapGenerationError:
+            failures += 1
+            continue
+        for name, value in measure_map(hex_map).items():
+            stats[name].add(value)
+    return stop - start, stats, failures
+
+
+def run(radius, maps, first_seed=0, workers=None, chunk=500, progress=False):
+    """Returns the merged statistics, the number of failed maps and the maps generated per second"""
+    tasks = [(radius, start, min(start + chunk, first_seed + maps))
+             for start in range(first_seed, first_seed + maps, chunk)]
+    stats = {name: RunningStats() for name in metric_names}
+    failures = 0
+    done = 0
+    start_time = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        # Statistics are merged as the tasks finish, no map leaves its worker
+        for task_maps, task_stats, task_failures in pool.imap_unordered(measure_seeds, tasks):
+            for name, one_stats in task_stats.items():
+                stats[name].merge(one_stats)
+            failures += task_failures
+            done += task_maps
+            if progress:
+                elapsed = time.perf_counter() - start_time
+                print(f"\r{done}/{maps} maps, {done / elapsed:.0f} maps/s", end="", flush=True)
+    if progress:
+        print()
+    return stats, failures, done / (time.perf_counter() - start_time)
+
+
+def print_stats(stats, failures):
+    print(f"{'metric':>20}{'mean':>10}{'std':>10}{'min':>10}{'max':>10}")
+    for name in metric_names:
+        one_stats = stats[name]
+        print(f"{name:>20}{one_stats.mean:>10.3f}{one_stats.std:>10.3f}{one_stats.minimum:>10.3f}"
+              f"{one_stats.maximum:>10.3f}")
+    print(f"failed maps {failures}")
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Balance statistics of generated maps")
+    parser.add_argument("--maps", type=int, default=10000)
+    parser.add_argument("--radius", type=int, default=settings.map_radius)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk", type=int, default=500)
+    parser.add_argument("--scaling", action="store_true")
+    args = parser.parse_args(args)
+
+    if args.scaling:
+        # The same seeds with more and more workers
+        workers = 1
+        print(f"{'workers':>8}{'maps/s':>10}{'speedup':>9}")
+        while True:
+            _, _, throughput = run(args.radius, args.maps, args.seed, workers, args.chunk)
+            if workers == 1:
+                single_throughput = throughput
+            print(f"{workers:>8}{throughput:>10.0f}{throughput / single_throughput:>9.2f}")
+            if workers >= args.workers:
+                break
+            workers = min(workers * 2, args.workers)
+        return
+
+    stats, failures, throughput = run(args.radius, args.maps, args.seed, args.workers, args.chunk, progress=True)
+    print(f"radius {args.radius}, seeds {args.seed}...{args.seed + args.maps - 1}, {args.workers} workers, "
+          f"{throughput:.0f} maps/s")
+    print_stats(stats, failures)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import pygame
+
+
+class Camera:
+    """Maps world pixels of the map to the screen: the world point in the screen center and the zoom
+
+    Hexagons keep their world x and y, only drawing and picking go through the camera."""
+    def __init__(self, screen_size, center, min_zoom=0.25, max_zoom=2, zoom_step=1.25):
+        self.screen_width, self.screen_height = screen_size
+        self.center_x, self.center_y = center
+
+        # The zoom is always zoom_step ** zoom_level, so images are scaled to a few sizes only
+        self.zoom_level = 0
+        self.zoom = 1
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.zoom_step = zoom_step
+
+        # Right mouse button drag
+        self.dragging = False
+
+    def world_to_screen(self, x, y):
+        return ((x - self.center_x) * self.zoom + self.screen_width / 2,
+                (y - self.center_y) * self.zoom + self.screen_height / 2)
+
+    def screen_to_world(self, x, y):
+        return ((x - self.screen_width / 2) / self.zoom + self.center_x,
+                (y - self.screen_height / 2) / self.zoom + self.center_y)
+
+    def get_visible_world_rect(self, margin=0):
+        """Returns (left, top, right, bottom) of the world seen on the screen, widened by margin world pixels"""
+        left, top = self.screen_to_world(0, 0)
+        right, bottom = self.screen_to_world(self.screen_width, self.screen_height)
+        return left - margin, top - margin, right + margin, bottom + margin
+
+    def is_visible(self, x, y, margin=0):
+        """Whether a screen point is on the screen or closer to it than margin screen pixels"""
+        return -margin <= x <= self.screen_width + margin and -margin <= y <= self.screen_height + margin
+
+    def pan(self, dx, dy):
+        """Moves the view by screen pixels"""
+        self.center_x += dx / self.zoom
+        self.center_y += dy / self.zoom
+
+    def zoom_at(self, steps, pos):
+        """Zooms in (steps > 0) or out keeping the world point under the screen point pos in place,
+        returns False if the zoom is already at its limit"""
+        zoom = self.zoom_step ** (self.zoom_level + steps)
+        if not steps or not self.min_zoom <= zoom <= self.max_zoom:
+            return False
+        world_x, world_y = self.screen_to_world(*pos)
+        self.zoom_level += steps
+        self.zoom = zoom
+        screen_x, screen_y = self.world_to_screen(world_x, world_y)
+        self.pan(screen_x - pos[0], screen_y - pos[1])
+        return True
+
+    def handle_input(self, event, pan_step):
+        """Arrow keys pan by pan_step, the right mouse button drags and the wheel zooms.
+        Returns True if the view changed"""
+        if event.type == pygame.KEYDOWN:
+            directions = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0), pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+            if event.key in directions:
+                dx, dy = directions[event.key]
+                self.pan(dx * pan_step, dy * pan_step)
+                return True
+        elif event.type == pygame.MOUSEWHEEL:
+            return self.zoom_at(event.y, pygame.mouse.get_pos())
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
+            self.dragging = True
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 3:
+            self.dragging = False
+        elif event.type == pygame.MOUSEMOTION and self.dragging and event.rel != (0, 0):
+            self.pan(-event.rel[0], -event.rel[1])
+            return True
+        return False
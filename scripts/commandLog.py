@@ -0,0 +1,129 @@
+import json
+import time
+
+from scripts.gameState import GameState
+from scripts.hexCell import HexCell
+from scripts.saveWriter import save_writer
+
+
+def encode_json_line(record):
+    return json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def encode_log(snapshot):
+    """Turns CommandLog.to_dict() into JSON lines: the header, then a line for every command"""
+    header = {key: value for key, value in snapshot.items() if key != "commands"}
+    return encode_json_line(header) + b"".join(map(encode_json_line, snapshot["commands"]))
+
+
+def command_from_json(items):
+    """JSON turns cords into lists, commands use tuples"""
+    return tuple(tuple(item) if isinstance(item, list) else item for item in items)
+
+
+class CommandLogError(Exception):
+    """The log cannot be read or the game went another way when it was played again"""
+
+
+class CommandLog:
+    """Everything needed to play a session again: how the map was made and the commands applied to it
+
+    Every command is stored with the seconds since the start of the session, so it can be played at real speed.
+    A map loaded from a save has no seed to generate it from, its cells are stored instead.
+
+    The file is JSON lines: the header with the map is written once, then every command is appended as one line,
+    so recording a command does not write the session again."""
+    VERSION = 2
+
+    def __init__(self, seed, radius, center_cords, initial_cells=None, file_path=None):
+        self.seed = seed
+        self.radius = radius
+        self.center_cords = tuple(center_cords)
+        self.initial_cells = initial_cells
+        self.file_path = file_path
+        self.commands = []
+        self.start_time = time.perf_counter()
+
+    @classmethod
+    def start(cls, state, radius, center_cords, generated=True, file_path=None):
+        """Starts recording every command the state applies"""
+        initial_cells = None if generated else [one_hex.to_dict() for one_hex in state.hex_map]
+        command_log = cls(state.seed, radius, center_cords, initial_cells, file_path)
+        command_log.write()
+        state.recorder = command_log
+        return command_log
+
+    def write(self):
+        """Writes the whole log again, the later commands are appended to it"""
+        if self.file_path:
+            save_writer.save(self.file_path, self.to_dict(), encode_log)
+
+    def record(self, command):
+        seconds = round(time.perf_counter() - self.start_time, 3)
+        self.commands.append((seconds, command))
+        if self.file_path:
+            save_writer.append(self.file_path, [seconds, *command], encode_json_line)
+
+    def truncate(self, count):
+        """Keeps the first count commands, the others were undone"""
+        del self.commands[count:]
+        self.write()
+
+    def to_dict(self):
+        return {
+            "version": self.VERSION,
+            "seed": self.seed,
+            "radius": self.radius,
+            "center_cords": list(self.center_cords),
+            "initial_cells": self.initial_cells,
+            "commands": [[seconds, *command] for seconds, command in self.commands]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != cls.VERSION:
+            raise CommandLogError(f"Unsupported command log version {data.get('version')}")
+        command_log = cls(data["seed"], data["radius"], data["center_cords"], data["initial_cells"])
+        command_log.commands = [(seconds, command_from_json(command)) for seconds, *command in data["commands"]]
+        return command_log
+
+    @classmethod
+    def load(cls, file_path):
+        try:
+            with open(file_path, encoding="utf-8") as file:
+                data = json.loads(file.readline())
+                data["commands"] = [json.loads(line) for line in file if line.strip()]
+        except (ValueError, TypeError) as error:
+            raise CommandLogError(f"'{file_path}' is not a command log: {error}")
+        return cls.from_dict(data)
+
+    def create_state(self):
+        """Returns the game state the session started from"""
+        if self.initial_cells is not None:
+            return GameState([HexCell.from_dict(cell) for cell in self.initial_cells], self.seed)
+        return GameState.generate(self.center_cords, self.radius, self.seed)
+
+    def get_turn_index(self, turn):
+        """Returns the number of commands played before the turn starts"""
+        end_turns = 0
+        for i, (_, command) in enumerate(self.commands):
+            if end_turns == turn:
+                return i
+            if command[0] == "end_turn":
+                end_turns += 1
+        if end_turns == turn:
+            return len(self.commands)
+        raise CommandLogError(f"The session has only {end_turns} turns")
+
+    def replay(self, state=None, start=0, stop=None):
+        """Applies the commands from start to stop to the state without rendering and returns the state"""
+        if state is None:
+            state = self.create_state()
+        for i, (_, command) in enumerate(self.commands[start:stop], start):
+            if not state.apply(command):
+                raise CommandLogError(f"Command {i} {command} did nothing, the replay went another way")
+        return state
+
+    def fast_forward(self, turn):
+        """Returns the game state at the start of the turn"""
+        return self.replay(stop=self.get_turn_index(turn))
@@ -2,25 +2,59 @@ from scripts.resourceManager import ResourceManager
 from scripts.settings import settings
 
 
-resource_manager = ResourceManager(settings.images_dir)
-
-# image load dictionary
-hex_images = {
-    'sun': resource_manager.load_image('Sun_Red.png'),
-    'spaceship': resource_manager.load_image('spaceship.png'),
-    'transport_spaceship': resource_manager.load_image('transport.png'),
-    'population': resource_manager.load_image('icon_population.png'),
-    'production': resource_manager.load_image('icon_gear.png'),
-    'fuel': resource_manager.load_image('icon_fuel_2.png'),
-    'tropical': resource_manager.load_image('Planet_Tropical.png'),
-    'snowy': resource_manager.load_image('Planet_Snowy.png'),
-    'ocean': resource_manager.load_image('Planet_Ocean.png'),
-    'lunar': resource_manager.load_image('Planet_Lunar.png'),
-    'muddy': resource_manager.load_image('Planet_Muddy.png'),
-    'cloudy': resource_manager.load_image('planet_Cloudy.png'),
-    'next_turn': resource_manager.load_image('icon_next_turn.png')
+# the only resource manager of the game, images are loaded on first use
+resource_manager = ResourceManager(settings.images_dir, settings.save_dir, settings.fonts_dir)
+
+# image manifest: key -> file in data/images
+image_manifest = {
+    'background': 'cosmos.jpg',
+    'icon': 'icon_population.png',
+    'sun': 'Sun_Red.png',
+    'spaceship': 'spaceship.png',
+    'transport_spaceship': 'transport.png',
+    'population': 'icon_population.png',
+    'production': 'icon_gear.png',
+    'fuel': 'icon_fuel_2.png',
+    'tropical': 'Planet_Tropical.png',
+    'snowy': 'Planet_Snowy.png',
+    'ocean': 'Planet_Ocean.png',
+    'lunar': 'Planet_Lunar.png',
+    'muddy': 'Planet_Muddy.png',
+    'cloudy': 'Planet_Cloudy.png',
+    'next_turn': 'icon_next_turn.png'
 }
 
+
+def get_image(key):
+    """Returns the original image by manifest key, loading it on first use"""
+    return resource_manager.load_image(image_manifest[key])
+
+
+def get_scaled_image(key, size, smooth=False):
+    """Returns the image by manifest key scaled to size from the resource manager cache"""
+    return resource_manager.get_scaled_image(image_manifest[key], size, smooth)
+
+
+def render_text(text, color, size=None, font_name=None):
+    """Returns the text surface from the resource manager cache, by default in the game font"""
+    return resource_manager.render_text(font_name, size or settings.font_size, text, color)
+
+
+def build_sprite_atlas():
+    """Packs planets, ships and icons at the sizes the game draws them into one atlas, call after init_display"""
+    hex_sprite_size = int(settings.hex_width) - settings.indent
+    menu_sprite_size = settings.planet_image_size - 2 * settings.menu_padding
+    sprites = []
+    for key in ('tropical', 'snowy', 'ocean', 'lunar', 'muddy', 'cloudy', 'spaceship', 'transport_spaceship'):
+        sprites.append((image_manifest[key], (hex_sprite_size, hex_sprite_size), False))
+        sprites.append((image_manifest[key], (menu_sprite_size, menu_sprite_size), False))
+    for key in ('population', 'production', 'fuel'):
+        for icon_size in (settings.icon_size, settings.menu_icon_size, settings.resource_button_height):
+            sprites.append((image_manifest[key], (icon_size, icon_size), False))
+    sprites.append((image_manifest['next_turn'], (settings.turn_button_size, settings.turn_button_size), False))
+    resource_manager.build_atlas(sprites)
+
+
 # planet types dictionary
 planet_types = {
     'tropical': {
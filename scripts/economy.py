@@ -0,0 +1,29 @@
+"""Planet economy of one turn
+
+All arithmetic is integer, the same state always gives the same turn.
+
+Per turn and planet:
+    population  grows by population_growth_rate percent of its planet type, up to max_population
+    production  grows by production_bonus of the planet type for every 100 inhabitants
+    fuel        grows by fuel_rate for every 100 inhabitants
+A planet specialized in a resource doubles the yield of that resource.
+"""
+
+
+def resolve_turn(planets, planet_types, max_population, fuel_rate):
+    """Applies growth, production and specialization yields to every planet
+
+    The cells are read as attributes, not through the dictionary interface, which is the most of the cost"""
+    for planet_hex in planets:
+        planet_type = planet_types[planet_hex.planet_type]
+        specialization = planet_hex.specialization
+        population = planet_hex.population
+        hundreds = population // 100
+
+        # A population above the cap (from an old save) is kept but does not grow
+        if population < max_population:
+            growth_rate = planet_type['population_growth_rate'] * (2 if specialization == "population" else 1)
+            planet_hex.population = min(population + population * growth_rate // 100, max_population)
+        planet_hex.production += (hundreds * planet_type['production_bonus'] *
+                                  (2 if specialization == "production" else 1))
+        planet_hex.fuel += hundreds * fuel_rate * (2 if specialization == "fuel" else 1)
@@ -0,0 +1,43 @@
+from scripts.utils import hex_distance
+
+
+# Map objects by hexagon value
+entity_kinds = {
+    2: 'planet',
+    3: 'spaceship',
+    4: 'transport_spaceship'
+}
+
+
+class EntityRegistry:
+    """Keeps map objects by kind and position, so lookups do not scan the whole map"""
+    def __init__(self):
+        self.entities = {kind: {} for kind in entity_kinds.values()}
+
+    @classmethod
+    def from_hex_map(cls, hex_map):
+        registry = cls()
+        for one_hex in hex_map:
+            if one_hex.value in entity_kinds:
+                registry.add(entity_kinds[one_hex.value], one_hex)
+        return registry
+
+    def add(self, kind, one_hex):
+        self.entities[kind][(one_hex["q"], one_hex["r"])] = one_hex
+
+    def remove(self, kind, one_hex):
+        self.entities[kind].pop((one_hex["q"], one_hex["r"]), None)
+
+    def move(self, kind, from_hex, to_hex):
+        self.remove(kind, from_hex)
+        self.add(kind, to_hex)
+
+    def get_all(self, kind):
+        return list(self.entities[kind].values())
+
+    def get_at(self, kind, q, r):
+        return self.entities[kind].get((q, r))
+
+    def get_nearest(self, kind, one_hex):
+        """Returns the object of the kind closest to one_hex or None"""
+        return min(self.entities[kind].values(), key=lambda other_hex: hex_distance(one_hex, other_hex), default=None)
@@ -0,0 +1,43 @@
+import time
+
+
+class FixedTimestep:
+    """Runs the simulation in steps of 1 / rate seconds whatever the frame rate is
+
+    The time left over after the last step gives the render interpolation between the two latest states.
+    After a long frame at most max_steps steps are run and the rest of the lag is dropped,
+    so a slow simulation cannot freeze the game trying to catch up."""
+    def __init__(self, rate, max_steps=5):
+        self.step_time = 1 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0
+        self.last_time = None
+        self.dropped_time = 0
+
+    def reset(self):
+        """Forgets the elapsed time, the next advance starts from now"""
+        self.accumulator = 0
+        self.last_time = None
+
+    def advance(self, update, active=True):
+        """Calls update(step_time) for every whole step since the last call and returns the interpolation
+        factor from 0 to 1. While not active nothing is simulated and the waiting time is not accumulated"""
+        if not active:
+            self.reset()
+            return 1
+
+        now = time.perf_counter()
+        if self.last_time is not None:
+            self.accumulator += now - self.last_time
+        self.last_time = now
+
+        steps = 0
+        while self.accumulator >= self.step_time:
+            if steps == self.max_steps:
+                self.dropped_time += self.accumulator - self.accumulator % self.step_time
+                self.accumulator %= self.step_time
+                break
+            update(self.step_time)
+            self.accumulator -= self.step_time
+            steps += 1
+        return self.accumulator / self.step_time
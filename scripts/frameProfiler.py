@@ -0,0 +1,121 @@
+import csv
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import pygame
+
+
+# Returned by scope() while profiling is off, so a disabled scope costs one call and an empty with
+null_scope = nullcontext()
+
+
+class TimingScope:
+    """Adds the time spent inside the with block to the current frame of the profiler"""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        frame = self.profiler.frame
+        frame[self.name] = frame.get(self.name, 0) + time.perf_counter() - self.start
+        return False
+
+
+class FrameProfiler:
+    """Times named phases of every frame, keeps rolling percentiles for the overlay and samples for CSV"""
+    def __init__(self, window=300, max_samples=100000):
+        self.enabled = False
+        self.overlay_visible = False
+
+        # Phase name -> seconds of the frame being measured
+        self.frame = {}
+        self.frame_start = None
+        self.frame_count = 0
+
+        # Phase name -> the last window durations, and (frame number, phases) of every measured frame
+        self.window = window
+        self.history = {}
+        self.samples = deque(maxlen=max_samples)
+
+        self.overlay_rect = None
+
+    def toggle(self):
+        """Switches profiling together with its overlay, when switched on the current frame is measured from now"""
+        self.enabled = self.overlay_visible = not self.enabled
+        self.frame = {}
+        self.frame_start = time.perf_counter() if self.enabled else None
+        self.overlay_rect = None
+
+    def scope(self, name):
+        if not self.enabled:
+            return null_scope
+        return TimingScope(self, name)
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame = {}
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or self.frame_start is None:
+            return
+        self.frame["frame"] = time.perf_counter() - self.frame_start
+        self.frame_start = None
+        self.frame_count += 1
+        for name, duration in self.frame.items():
+            if name not in self.history:
+                self.history[name] = deque(maxlen=self.window)
+            self.history[name].append(duration)
+        self.samples.append((self.frame_count, self.frame))
+
+    def get_percentiles(self, name):
+        """Returns (p50, p99) of the phase in seconds over the rolling window"""
+        durations = sorted(self.history[name])
+        return (durations[len(durations) // 2],
+                durations[min(len(durations) - 1, len(durations) * 99 // 100)])
+
+    def draw_overlay(self, screen, font, pos, color, background_color, column_width=70):
+        """Draws p50 and p99 of every phase in milliseconds and returns the changed rect"""
+        rows = [("phase", "p50 ms", "p99 ms")]
+        for name in sorted(self.history):
+            p50, p99 = self.get_percentiles(name)
+            rows.append((name, f"{p50 * 1000:.2f}", f"{p99 * 1000:.2f}"))
+
+        # The numbers change every frame, so they are rendered directly and not through the text cache
+        rendered_rows = [[font.render(cell, True, color) for cell in row] for row in rows]
+        name_width = max(row[0].get_width() for row in rendered_rows) + font.size(" ")[0]
+        line_height = font.get_linesize()
+        rect = pygame.Rect(pos, (name_width + column_width * 2, line_height * len(rows)))
+
+        # The rect only grows, so the opaque box covers everything drawn before
+        if self.overlay_rect is not None:
+            rect.union_ip(self.overlay_rect)
+        self.overlay_rect = rect
+        pygame.draw.rect(screen, background_color, rect)
+        for i, (name_text, p50_text, p99_text) in enumerate(rendered_rows):
+            y = rect.y + i * line_height
+            screen.blit(name_text, (rect.x, y))
+            # Numbers are right-aligned in their columns
+            screen.blit(p50_text, (rect.x + name_width + column_width - p50_text.get_width(), y))
+            screen.blit(p99_text, (rect.x + name_width + column_width * 2 - p99_text.get_width(), y))
+        return rect
+
+    def export_csv(self, file_path):
+        """Writes one row per measured frame with milliseconds of every phase, empty if it did not run"""
+        names = sorted({name for _, frame in self.samples for name in frame})
+        with open(file_path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["frame_number"] + names)
+            for frame_number, frame in self.samples:
+                writer.writerow([frame_number] + [f"{frame[name] * 1000:.4f}" if name in frame else ""
+                                                  for name in names])
+
+
+profiler = FrameProfiler()
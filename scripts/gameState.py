@@ -0,0 +1,232 @@
+import random
+
+from scripts.constants import planet_types
+from scripts.economy import resolve_turn
+from scripts.entityRegistry import EntityRegistry
+from scripts.mapGenerator import build_hex_index, generate_hex_map
+from scripts.pathfinding import DistanceField
+from scripts.utils import hex_neighbor_coords, hex_ring_coords, hex_range_coords
+
+
+class GameState:
+    """Game rules without rendering: the map, its objects and turns, changed only through commands
+
+    Commands are tuples with hexagons given by cords (q, r):
+        ("move", spaceship_cords, target_cords)
+        ("transfer", planet_cords, resource, amount)
+        ("specialize", planet_cords, specialization)
+        ("visit_transport", transport_cords)
+        ("end_turn",)
+    """
+    commands = {
+        "move": "move_spaceship",
+        "transfer": "transfer_resource",
+        "specialize": "specialize_planet",
+        "visit_transport": "visit_transport",
+        "end_turn": "end_turn"
+    }
+
+    def __init__(self, hex_map, seed=None):
+        self.hex_map = hex_map
+        self.seed = seed
+        self.hex_index = build_hex_index(hex_map)
+        self.entities = EntityRegistry.from_hex_map(hex_map)
+        self.moved_spaceships = set()
+
+        # Gets every command that changed the state, see CommandLog
+        self.recorder = None
+
+        # Hexagons changed by the current command and the snapshots taken after every command, see StateHistory
+        self.changed_hexes = set()
+        self.history = None
+
+        # Economy: population cap and fuel for every 100 inhabitants of a planet per turn
+        self.max_planet_population = 3000
+        self.planet_fuel_rate = 2
+
+        # Saves made before the economy have no planet stocks
+        for planet_hex in self.entities.get_all('planet'):
+            for resource in ('fuel', 'production'):
+                if resource not in planet_hex:
+                    planet_hex[resource] = 0
+
+        # Movement: fuel for every step, routes from every spaceship are kept until an obstacle moves
+        self.move_cost = 5
+        self.distance_fields = {}
+
+        # Turns
+        self.turn_count = 0
+        self.max_turns = 50
+        self.game_over = False
+
+        # Turn restrictions
+        self.turns_since_last_specialization = 0
+        self.specialization_cooldown = 5
+        self.can_specialize = True
+
+    @classmethod
+    def generate(cls, center_cords, radius, seed=None):
+        # A random seed is still chosen explicitly, so every map can be generated again
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        return cls(generate_hex_map(center_cords, radius, seed), seed)
+
+    def apply(self, command):
+        """Runs the command and returns True if it changed the state"""
+        name, *args = command
+        changed = getattr(self, self.commands[name])(*args)
+        if changed:
+            if self.history is not None:
+                self.history.capture(self.changed_hexes)
+            if self.recorder is not None:
+                self.recorder.record(command)
+        self.changed_hexes.clear()
+        return changed
+
+    # Queries
+
+    def get_hex(self, q, r):
+        """Returns the hexagon with cords (q, r) or None"""
+        return self.hex_index.get((q, r))
+
+    def get_hexes(self, coords):
+        return [self.hex_index[one_coords] for one_coords in coords if one_coords in self.hex_index]
+
+    def get_neighbors(self, one_hex):
+        """Returns the existing hexagons adjacent to one_hex"""
+        return self.get_hexes(hex_neighbor_coords(one_hex["q"], one_hex["r"]))
+
+    def get_ring(self, one_hex, radius):
+        """Returns the existing hexagons exactly radius steps away from one_hex"""
+        return self.get_hexes(hex_ring_coords(one_hex["q"], one_hex["r"], radius))
+
+    def get_range(self, one_hex, radius):
+        """Returns the existing hexagons at most radius steps away from one_hex"""
+        return self.get_hexes(hex_range_coords(one_hex["q"], one_hex["r"], radius))
+
+    def is_next_to_spaceship(self, one_hex):
+        """Planets and transports can only be used from an adjacent spaceship"""
+        return any(self.entities.get_at('spaceship', q, r)
+                   for q, r in hex_neighbor_coords(one_hex["q"], one_hex["r"]))
+
+    def can_move_spaceship(self, spaceship_hex):
+        """Every spaceship can move once per turn"""
+        return (spaceship_hex["q"], spaceship_hex["r"]) not in self.moved_spaceships
+
+    def get_distance_field(self, spaceship_hex):
+        """Routes of the spaceship as far as its fuel allows, built again only when obstacles move or fuel grows"""
+        spaceship_cords = (spaceship_hex["q"], spaceship_hex["r"])
+        distance_field = self.distance_fields.get(spaceship_cords)
+        if distance_field is None or not distance_field.covers(spaceship_hex["fuel"]):
+            distance_field = DistanceField(self.hex_index, spaceship_cords, self.move_cost, spaceship_hex["fuel"])
+            self.distance_fields[spaceship_cords] = distance_field
+        return distance_field
+
+    def get_movement_area(self, spaceship_hex):
+        """Returns the empty hexagons the spaceship can reach with its fuel"""
+        return self.get_hexes(self.get_distance_field(spaceship_hex).get_reachable(spaceship_hex["fuel"]))
+
+    def get_path(self, spaceship_hex, target_hex):
+        """Returns the hexagons of the cheapest route to target_hex, empty if the fuel is not enough for it"""
+        distance_field = self.get_distance_field(spaceship_hex)
+        target_cords = (target_hex["q"], target_hex["r"])
+        cost = distance_field.get_cost(target_cords)
+        if cost is None or cost > spaceship_hex["fuel"]:
+            return []
+        return self.get_hexes(distance_field.get_path(target_cords))
+
+    def get_transfer_amount(self, planet_hex, resource):
+        """A specialized planet gives 100 of its specialization resource and 10 of the others, once per visit,
+        as long as it has the resource"""
+        specialization = planet_hex["specialization"]
+        if not specialization or not planet_hex["is_planet_active"] or planet_hex[resource] <= 0:
+            return 0
+        return 100 if resource == specialization else 10
+
+    # Commands
+
+    def move_spaceship(self, spaceship_cords, target_cords):
+        """Moves the spaceship along the cheapest route, every step costs move_cost fuel"""
+        spaceship_hex = self.entities.get_at('spaceship', *spaceship_cords)
+        target_hex = self.get_hex(*target_cords)
+        if spaceship_hex is None or target_hex is None or not self.can_move_spaceship(spaceship_hex):
+            return False
+        cost = self.get_distance_field(spaceship_hex).get_cost((target_hex["q"], target_hex["r"]))
+        if not cost or cost > spaceship_hex["fuel"]:
+            return False
+
+        target_hex["value"] = 3
+        target_hex["fuel"] = spaceship_hex["fuel"] - cost
+        target_hex["population"] = spaceship_hex["population"]
+        target_hex["production"] = spaceship_hex["production"]
+        spaceship_hex["value"] = 0
+        del spaceship_hex["fuel"]
+        del spaceship_hex["population"]
+        del spaceship_hex["production"]
+        self.entities.move('spaceship', spaceship_hex, target_hex)
+        self.moved_spaceships.add((target_hex["q"], target_hex["r"]))
+        self.changed_hexes.update((spaceship_hex, target_hex))
+
+        # The spaceship is an obstacle for the routes of the others
+        self.distance_fields.clear()
+        return True
+
+    def transfer_resource(self, planet_cords, resource, amount):
+        """Transfers fuel, population or production from the planet stock to the nearest spaceship"""
+        planet_hex = self.entities.get_at('planet', *planet_cords)
+        if (planet_hex is None or planet_hex["population"] <= 0 or not self.is_next_to_spaceship(planet_hex) or
+                amount != self.get_transfer_amount(planet_hex, resource)):
+            return False
+
+        nearest_spaceship = self.entities.get_nearest('spaceship', planet_hex)
+        amount = min(amount, planet_hex[resource])
+        planet_hex[resource] -= amount
+        nearest_spaceship[resource] += amount
+        planet_hex["is_planet_active"] = False
+        self.changed_hexes.update((planet_hex, nearest_spaceship))
+        return True
+
+    def specialize_planet(self, planet_cords, specialization):
+        planet_hex = self.entities.get_at('planet', *planet_cords)
+        if planet_hex is None or not self.can_specialize or not self.is_next_to_spaceship(planet_hex):
+            return False
+        planet_hex["specialization"] = specialization
+        self.can_specialize = False
+        self.changed_hexes.add(planet_hex)
+        return True
+
+    def visit_transport(self, transport_cords):
+        """Visiting the transport spaceship makes every planet give resources again,
+        a visit while every planet is active changes nothing"""
+        transport_hex = self.entities.get_at('transport_spaceship', *transport_cords)
+        if transport_hex is None or not self.is_next_to_spaceship(transport_hex):
+            return False
+        planets = [planet_hex for planet_hex in self.entities.get_all('planet') if not planet_hex["is_planet_active"]]
+        if not planets:
+            return False
+        for planet_hex in planets:
+            planet_hex["is_planet_active"] = True
+        self.changed_hexes.update(planets)
+        return True
+
+    def end_turn(self):
+        """Changes the turn and checks whether the game is finished"""
+        if self.game_over:
+            return False
+        planets = self.entities.get_all('planet')
+        resolve_turn(planets, planet_types, self.max_planet_population, self.planet_fuel_rate)
+        self.changed_hexes.update(planets)
+        for spaceship_hex in self.entities.get_all('spaceship'):
+            if spaceship_hex['fuel'] <= 0:
+                self.game_over = True
+        if self.turn_count >= self.max_turns:
+            self.game_over = True
+        self.turn_count += 1
+
+        if not self.can_specialize:
+            self.turns_since_last_specialization += 1
+            if self.turns_since_last_specialization >= self.specialization_cooldown:
+                self.can_specialize = True
+                self.turns_since_last_specialization = 0
+        self.moved_spaceships.clear()
+        return True
@@ -0,0 +1,65 @@
+# Value of an optional field that is not set, in snapshots
+missing = object()
+
+
+def snapshot_to_dict(values):
+    """Turns HexCell.snapshot() into the dictionary of the set fields"""
+    return {key: value for key, value in zip(HexCell.__slots__, values) if value is not missing}
+
+
+class HexCell:
+    """One map hexagon with fixed fields, also readable and writable like the old dictionary cells"""
+    __slots__ = ('q', 'r', 'value', 'x', 'y', 'fuel', 'population', 'production',
+                 'planet_type', 'specialization', 'is_planet_active')
+    fields = frozenset(__slots__)
+
+    def __init__(self, q, r, value, x, y):
+        self.q = q
+        self.r = r
+        self.value = value
+        self.x = x
+        self.y = y
+
+    @classmethod
+    def from_dict(cls, data):
+        one_hex = cls(data["q"], data["r"], data["value"], data["x"], data["y"])
+        for key, value in data.items():
+            one_hex[key] = value
+        return one_hex
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.keys()}
+
+    def snapshot(self):
+        """Returns the values of all fields in slot order, missing for the ones that are not set"""
+        return tuple([getattr(self, key, missing) for key in self.__slots__])
+
+    def keys(self):
+        """Returns the names of the fields that are set, optional ones may be missing"""
+        return [key for key in self.__slots__ if hasattr(self, key)]
+
+    def get(self, key, default=None):
+        if key not in self.fields:
+            return default
+        return getattr(self, key, default)
+
+    def __getitem__(self, key):
+        if key not in self.fields or not hasattr(self, key):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.fields:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __delitem__(self, key):
+        if key not in self.fields or not hasattr(self, key):
+            raise KeyError(key)
+        delattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.fields and hasattr(self, key)
+
+    def __repr__(self):
+        return f"HexCell({self.to_dict()})"
@@ -1,100 +1,73 @@
 import pygame
 import os
-import json
-import random
 
 from scripts.settings import settings
-from scripts.utils import hex_distance, get_hex_points
-from scripts.constants import hex_images, planet_types
-
-
-def generate_hex_map(center_coords, radius):
-    """Generating a map and assigning values to hexagons"""
-    hex_map = []
-
-    for map_q in range(-radius, radius + 1):
-        for map_r in range(max(-radius, -map_q - radius), min(radius, -map_q + radius) + 1):
-            x = center_coords[0] + (map_q * settings.x_offset) + (map_r * settings.x_offset / 2)
-            y = center_coords[1] + (map_r * settings.y_offset)
-            if 0 <= x <= settings.width and 0 <= y <= settings.height:
-                hex_map.append({"q": map_q, "r": map_r, "value": 0, "x": x, "y": y})
-
-    # Creating sun with value 1
-    sun_hex_coords = [(0, 0), (1, 0), (0, 1), (-1, 1), (-1, 0), (0, -1), (1, -1)]
-    for one_hex in hex_map:
-        if (one_hex["q"], one_hex["r"]) in sun_hex_coords:
-            one_hex["value"] = 1
-
-    empty_hex = [one_hex for one_hex in hex_map if one_hex["value"] == 0]
-
-    # Creating transport spaceship with value 4
-    while True:
-        chosen_hex = random.choice(empty_hex)
-        if (chosen_hex["r"] == radius or chosen_hex["r"] == -radius or chosen_hex["q"] == radius or
-                chosen_hex["q"] == -radius or -chosen_hex["q"] - chosen_hex["r"] == radius or
-                -chosen_hex["q"] - chosen_hex["r"] == -radius):
-            break
-    chosen_hex["value"] = 4
-    chosen_hex["population"] = 0
-    empty_hex.remove(chosen_hex)
-    transport_spaceship_hex = chosen_hex
-
-    # Creating planets with value 2
-    planet_types_list = list(planet_types.keys())
-    random.shuffle(planet_types_list)
-    planet_count = random.randint(5, 6)
-    total_population = 6000
-    population_options = [1100, 1200, 1300] if planet_count == 5 else [900, 1000, 1100]
-
-    planets = []
-    for _ in range(planet_count):
-        while True:
-            chosen_hex = random.choice(empty_hex)
-            if hex_distance(chosen_hex, transport_spaceship_hex) >= 4 and all(
-                    hex_distance(chosen_hex, p) >= 3 for p in planets) and hex_distance(chosen_hex, next(
-                    h for h in hex_map if h["value"] == 1)) >= 2:
-                break
-        chosen_hex["value"] = 2
-        chosen_hex["planet_type"] = planet_types_list[_ % len(planet_types_list)]
-        chosen_hex["specialization"] = None
-        chosen_hex["is_planet_active"] = True
-        planets.append(chosen_hex)
-        empty_hex.remove(chosen_hex)
-
-    assigned_population = 0
-    for i in range(len(planets) - 1):
-        pop = random.choice(
-            [p for p in population_options if assigned_population + p + min(population_options) <= total_population])
-        planets[i]["population"] = pop
-        assigned_population += pop
-
-    planets[-1]["population"] = total_population - assigned_population
-
-    # Creating spaceship with value 3
-    adjacent_hexes = [h for h in empty_hex if hex_distance(h, transport_spaceship_hex) == 1]
-    if adjacent_hexes:
-        chosen_hex = random.choice(adjacent_hexes)
-        chosen_hex["value"] = 3
-        chosen_hex["fuel"] = 100
-        chosen_hex["population"] = 0
-        chosen_hex["production"] = 0
-        empty_hex.remove(chosen_hex)
-
-    return hex_map
+from scripts.utils import get_hex_points, hex_coords_in_rect, pixel_to_hex_coords
+from scripts.camera import Camera
+from scripts.commandLog import CommandLog
+from scripts.constants import get_scaled_image, planet_types, render_text
+from scripts.frameProfiler import profiler
+from scripts.gameState import GameState
+from scripts.saveFormat import encode_map_snapshot
+from scripts.saveWriter import save_writer
+from scripts.stateHistory import StateHistory
 
 
 class HexMap:
-    """Responsible for the map in the main game"""
-    def __init__(self, center_cords, radius):
-        self.hex_map = generate_hex_map(center_cords, radius)
+    """Responsible for the map in the main game: selection, menus and drawing over the game state"""
+    def __init__(self, center_cords, radius, background=None, seed=None, saved_map=None, state=None, autosave=True):
+        self.center_cords = center_cords
+        if state is not None:
+            # A state prepared elsewhere, for example by a replay
+            self.state = state
+        elif saved_map is not None:
+            # Restoring a map from ResourceManager.load_saves without generating it
+            self.state = GameState(*saved_map)
+        else:
+            self.state = GameState.generate(center_cords, radius, seed)
+        self.hex_map = self.state.hex_map
+        self.entities = self.state.entities
+
+        # Without autosave nothing is written: no map saves and no command log
+        self.autosave = autosave
+        self.command_log = None
+        if autosave:
+            self.command_log = CommandLog.start(self.state, radius, center_cords,
+                                                generated=saved_map is None and state is None,
+                                                file_path=os.path.join(settings.save_dir, "session.jsonl"))
+
+        # Snapshots after every command for undo and rewind
+        self.history = StateHistory(self.state)
+
+        # The map center starts in the screen center, hexagon x and y are world pixels
+        self.camera = Camera((settings.width, settings.height), center_cords)
         self.selected_spaceship = None
         self.movement_hex = []
         self.selected_planet = None
         self.selected_transport = None
-        self.spaceship_moved_this_turn = False
-        self.font = pygame.font.Font(None, 30)
+
+        # Route of the selected spaceship to the hexagon under the cursor
+        self.hovered_hex = None
+        self.hover_path = []
+
+        # Cells of the latest save and the hexagons that had objects then, see save_map
+        self.positions = {(one_hex.q, one_hex.r): i for i, one_hex in enumerate(self.hex_map)}
+        self.saved_cells = None
+        self.saved_entity_cords = set()
         self.save_map()
 
+        # Rendering: background, grid, planets and sun are baked into the static layer,
+        # everything else is drawn on top of it and tracked by rectangles
+        self.background = background
+        self.static_layer = None
+        self.static_layer_dirty = True
+        self.needs_redraw = True
+        self.overlay_rects = []
+
+        # Spaceship flying along its route: the hexagon it flies to, world points of the route
+        # and the distance flown in hexagons at the previous and the latest simulation step
+        self.travel = None
+
         # Status
         self.planet_menu_active = False
         self.transport_menu_active = False
@@ -115,29 +88,58 @@ class HexMap:
         self.specialize_population_rect = None
         self.specialize_production_rect = None
 
-        # Turn restrictions
-        self.turns_since_last_specialization = 0
-        self.specialization_cooldown = 5
-        self.can_specialize = True
-
     def save_map(self):
-        file_path = os.path.join(settings.save_dir, "map.json")
-        with open(file_path, "w") as file:
-            json.dump(self.hex_map, file, indent=4)
+        """Hands a snapshot of the map to the background save writer, which also builds the dictionaries
+
+        Commands only change hexagons with objects and the ones a spaceship leaves, so after the first save only
+        the hexagons with objects now or at the previous save are copied, the other cells are shared"""
+        if not self.autosave:
+            return
+        entity_cords = {cords for entities in self.entities.entities.values() for cords in entities}
+        if self.saved_cells is None:
+            cells = [one_hex.snapshot() for one_hex in self.hex_map]
+        else:
+            cells = list(self.saved_cells)
+            for cords in entity_cords | self.saved_entity_cords:
+                cells[self.positions[cords]] = self.state.hex_index[cords].snapshot()
+        self.saved_cells = cells
+        self.saved_entity_cords = entity_cords
+        file_path = os.path.join(settings.save_dir, "map.sav")
+        save_writer.save(file_path, (self.state.seed, cells), encode_map_snapshot)
+
+    def end_turn(self):
+        """Ends the turn in the game state, returns False if the game is over"""
+        if not self.state.apply(("end_turn",)):
+            return False
+        self.update()
+        return True
 
     def update(self):
         """Call every turn"""
-        if not self.can_specialize:
-            self.turns_since_last_specialization += 1
-            if self.turns_since_last_specialization >= self.specialization_cooldown:
-                self.can_specialize = True
-                self.turns_since_last_specialization = 0
         self.deselect_all()
-        self.spaceship_moved_this_turn = False
+        self.needs_redraw = True
         self.save_map()
 
+    def invalidate_static_layer(self):
+        """Call when a hex value or planet type changes"""
+        self.static_layer_dirty = True
+        self.needs_redraw = True
+
+    def build_static_layer(self, screen, turn):
+        """Bakes background, the visible hex grid and planets, sun and the turn button into one surface"""
+        if self.background is not None:
+            self.static_layer = self.background.copy()
+        else:
+            self.static_layer = pygame.Surface(screen.get_size())
+        with profiler.scope("draw_hex"):
+            for one_hex in self.get_visible_hexes():
+                self.draw_hex(self.static_layer, one_hex)
+        self.draw_hex_image(self.static_layer, 'sun', 2.5)
+        turn.draw_turn_button(self.static_layer)
+        self.static_layer_dirty = False
+
     def get_clicked_hex(self, pos):
-        mouse_x, mouse_y = pos
+        self.needs_redraw = True
 
         # Planet menu buttons
         if self.planet_menu_active:
@@ -148,54 +150,25 @@ class HexMap:
                 self.selected_planet = None
                 return
 
-            # Fuel buttons click
-            elif (self.fuel_button_100_rect and self.fuel_button_100_rect.collidepoint(pos) and
-                  self.selected_planet['is_planet_active']):
-                self.add_resource_to_spaceship("fuel", 100)
-                self.selected_planet['is_planet_active'] = False
-                return
-            elif (self.fuel_button_10_rect and self.fuel_button_10_rect.collidepoint(pos) and
-                  self.selected_planet['is_planet_active']):
-                self.add_resource_to_spaceship("fuel", 10)
-                self.selected_planet['is_planet_active'] = False
-                return
-
-            # Population buttons click
-            elif (self.population_button_100_rect and self.population_button_100_rect.collidepoint(pos) and
-                  self.selected_planet['is_planet_active']):
-                self.transfer_population_to_ship(100)
-                self.selected_planet['is_planet_active'] = False
-                return
-            elif (self.population_button_10_rect and self.population_button_10_rect.collidepoint(pos) and
-                  self.selected_planet['is_planet_active']):
-                self.transfer_population_to_ship(10)
-                self.selected_planet['is_planet_active'] = False
-                return
-
-            # Production buttons click
-            elif (self.production_button_100_rect and self.production_button_100_rect.collidepoint(pos) and
-                 self.selected_planet['is_planet_active']):
-                self.add_resource_to_spaceship("production", 100)
-                self.selected_planet['is_planet_active'] = False
-                return
-            elif (self.production_button_10_rect and self.production_button_10_rect.collidepoint(pos) and
-                 self.selected_planet['is_planet_active']):
-                self.add_resource_to_spaceship("production", 10)
-                self.selected_planet['is_planet_active'] = False
-                return
+            # Resource buttons click
+            resource_buttons = [(self.fuel_button_100_rect, "fuel", 100), (self.fuel_button_10_rect, "fuel", 10),
+                                (self.population_button_100_rect, "population", 100),
+                                (self.population_button_10_rect, "population", 10),
+                                (self.production_button_100_rect, "production", 100),
+                                (self.production_button_10_rect, "production", 10)]
+            for button_rect, resource, amount in resource_buttons:
+                if button_rect and button_rect.collidepoint(pos):
+                    self.transfer_resource(resource, amount)
+                    return
 
             # Specialization buttons click
-            elif self.specialize_fuel_rect and self.specialize_fuel_rect.collidepoint(pos) and self.can_specialize:
-                self.set_planet_specialization("fuel")
-                return
-            elif (self.specialize_population_rect and self.specialize_population_rect.collidepoint(pos) and
-                  self.can_specialize):
-                self.set_planet_specialization("population")
-                return
-            elif (self.specialize_production_rect and self.specialize_production_rect.collidepoint(pos) and
-                  self.can_specialize):
-                self.set_planet_specialization("production")
-                return
+            specialization_buttons = [(self.specialize_fuel_rect, "fuel"),
+                                      (self.specialize_population_rect, "population"),
+                                      (self.specialize_production_rect, "production")]
+            for button_rect, specialization in specialization_buttons:
+                if button_rect and button_rect.collidepoint(pos):
+                    self.set_planet_specialization(specialization)
+                    return
 
             # If none of the buttons were clicked, exit the function
             return
@@ -207,34 +180,99 @@ class HexMap:
                 self.selected_transport = None
             return
 
-        nearest_hex = min(self.hex_map, key=lambda h: (mouse_x - h["x"]) ** 2 + (mouse_y - h["y"]) ** 2)
+        nearest_hex = self.get_hex_at(pos)
         # Selected hexagon
-        if self.selected_spaceship and nearest_hex in self.movement_hex and not self.spaceship_moved_this_turn:
+        if nearest_hex is None:
+            self.deselect_all()
+        elif self.selected_spaceship and nearest_hex in self.movement_hex:
             self.move_spaceship(nearest_hex)
-        elif nearest_hex["value"] == 3 and not self.spaceship_moved_this_turn:
+        elif nearest_hex["value"] == 3 and self.state.can_move_spaceship(nearest_hex):
             self.select_spaceship(nearest_hex)
-        elif nearest_hex["value"] == 2 and self.can_select_object(nearest_hex):
+        elif nearest_hex["value"] == 2 and self.state.is_next_to_spaceship(nearest_hex):
             self.select_planet(nearest_hex)
-        elif nearest_hex["value"] == 4 and self.can_select_object(nearest_hex):
+        elif nearest_hex["value"] == 4 and self.state.is_next_to_spaceship(nearest_hex):
             self.select_transport_spaceship(nearest_hex)
         else:
             self.deselect_all()
 
     def move_spaceship(self, target_hex):
-        target_hex["value"] = 3
-        target_hex["fuel"] = self.selected_spaceship["fuel"] - 5
-        target_hex["population"] = self.selected_spaceship["population"]
-        target_hex["production"] = self.selected_spaceship["production"]
-        self.selected_spaceship["value"] = 0
-        del self.selected_spaceship["fuel"]
-        del self.selected_spaceship["population"]
-        del self.selected_spaceship["production"]
+        spaceship_cords = (self.selected_spaceship["q"], self.selected_spaceship["r"])
+        path = self.state.get_path(self.selected_spaceship, target_hex)
+        start = (self.selected_spaceship["x"], self.selected_spaceship["y"])
+        moved = self.state.apply(("move", spaceship_cords, (target_hex["q"], target_hex["r"])))
+        if moved:
+            # The state has the spaceship at the target already, only its image flies there
+            self.travel = {"hex": target_hex, "points": [start] + [(one_hex["x"], one_hex["y"]) for one_hex in path],
+                           "previous": 0, "current": 0}
         self.deselect_all()
-        self.spaceship_moved_this_turn = True
+        return moved
+
+    def apply_command(self, command):
+        """Applies a command from a command log the way the player's input would,
+        returns True if it changed the state"""
+        self.needs_redraw = True
+        if command[0] not in self.state.commands:
+            return False
+        if command[0] == "move":
+            # A stale or corrupt log may point at a hexagon without a spaceship or outside the map
+            spaceship_hex = self.entities.get_at('spaceship', *command[1])
+            target_hex = self.state.get_hex(*command[2])
+            if spaceship_hex is None or target_hex is None:
+                return False
+            self.selected_spaceship = spaceship_hex
+            return self.move_spaceship(target_hex)
+        if command[0] == "end_turn":
+            return self.end_turn()
+        return self.state.apply(command)
+
+    def undo(self):
+        """Undoes the last command, returns False if there is nothing to undo"""
+        return self.forget_commands(self.history.undo())
+
+    def rewind(self):
+        """Returns to the start of the turn, or of the previous turn if nothing was done in this one"""
+        turn = self.state.turn_count
+        if self.history.get_turn_index(turn) == len(self.history.snapshots) - 1:
+            turn -= 1
+        return self.forget_commands(self.history.rewind(turn))
+
+    def forget_commands(self, undone):
+        """Drops the undone commands from the command log and shows the restored state"""
+        if not undone:
+            return False
+        if self.command_log is not None:
+            self.command_log.truncate(len(self.command_log.commands) - undone)
+        self.travel = None
+        self.invalidate_static_layer()
+        self.update()
+        return True
+
+    def is_animating(self):
+        return self.travel is not None
+
+    def simulate(self, dt):
+        """One fixed simulation step of dt seconds"""
+        if self.travel:
+            self.travel["previous"] = self.travel["current"]
+            self.travel["current"] = min(self.travel["current"] + settings.spaceship_speed * dt,
+                                         len(self.travel["points"]) - 1)
+            if self.travel["previous"] == len(self.travel["points"]) - 1:
+                self.travel = None
+            self.needs_redraw = True
+
+    def get_travel_point(self, alpha):
+        """Returns the world point of the flying spaceship between the last two simulation steps"""
+        distance = self.travel["previous"] + (self.travel["current"] - self.travel["previous"]) * alpha
+        points = self.travel["points"]
+        i = min(int(distance), len(points) - 2)
+        (x1, y1), (x2, y2) = points[i], points[i + 1]
+        return x1 + (x2 - x1) * (distance - i), y1 + (y2 - y1) * (distance - i)
 
     def select_spaceship(self, hex):
         self.selected_spaceship = hex
-        self.movement_area(hex)
+        self.movement_hex = self.state.get_movement_area(hex)
+        self.hovered_hex = None
+        self.hover_path = []
         self.selected_planet = None
 
     def select_planet(self, hex):
@@ -245,9 +283,7 @@ class HexMap:
 
     def select_transport_spaceship(self, hex):
         self.selected_transport = hex
-        for other_hex in self.hex_map:
-            if other_hex["value"] == 2:
-                other_hex["is_planet_active"] = True
+        self.state.apply(("visit_transport", (hex["q"], hex["r"])))
         self.transport_menu_active = True
         self.selected_spaceship = None
         self.movement_hex = []
@@ -255,167 +291,222 @@ class HexMap:
     def deselect_all(self):
         self.selected_spaceship = None
         self.movement_hex = []
+        self.hovered_hex = None
+        self.hover_path = []
         self.selected_planet = None
         self.planet_menu_active = False
         self.transport_menu_active = False
 
-    def can_select_object(self, object_hex):
-        for other_hex in self.hex_map:
-            if other_hex["value"] == 3 and hex_distance(object_hex, other_hex) == 1:
-                return True
-        return False
-
-    def movement_area(self, start_hex):
-        self.movement_hex = [h for h in self.hex_map if hex_distance(start_hex, h) == 1 and h["value"] == 0]
+    def hover(self, pos):
+        """Shows the route of the selected spaceship to the hexagon under the cursor"""
+        if not self.selected_spaceship:
+            return
+        one_hex = self.get_hex_at(pos)
+        if one_hex is self.hovered_hex:
+            return
+        self.hovered_hex = one_hex
+        self.hover_path = self.state.get_path(self.selected_spaceship, one_hex) if one_hex else []
+        self.needs_redraw = True
+
+    def get_hex_at(self, pos):
+        """Returns the hexagon under the screen point or None if it is outside the map"""
+        x, y = self.camera.screen_to_world(*pos)
+        q, r = pixel_to_hex_coords(x, y, self.center_cords, settings.x_offset, settings.y_offset)
+        return self.state.get_hex(q, r)
+
+    def get_visible_hexes(self):
+        """Returns the hexagons on the screen, found by their cords without going through the whole map"""
+        visible_rect = self.camera.get_visible_world_rect(margin=settings.hex_radius)
+        return self.state.get_hexes(hex_coords_in_rect(*visible_rect, self.center_cords,
+                                                       settings.x_offset, settings.y_offset))
+
+    def handle_camera_input(self, event):
+        """Pans and zooms the map, the static layer is drawn again for the new view"""
+        if self.camera.handle_input(event, settings.camera_pan_step):
+            self.invalidate_static_layer()
+
+    def to_screen(self, one_hex):
+        """Returns the screen point of the hexagon center"""
+        return self.camera.world_to_screen(one_hex["x"], one_hex["y"])
+
+    def scale(self, length):
+        """Returns a world length in screen pixels"""
+        return length * self.camera.zoom
 
     def set_planet_specialization(self, specialization):
         """Sets the planet's specialization and updates the hex_map"""
         if self.selected_planet:
-            self.selected_planet["specialization"] = specialization
-            self.save_map()
-            self.can_specialize = False
+            planet_cords = (self.selected_planet["q"], self.selected_planet["r"])
+            if self.state.apply(("specialize", planet_cords, specialization)):
+                self.save_map()
 
-    def transfer_population_to_ship(self, amount):
-        """Transfers population from the selected planet to the nearest spaceship"""
-        nearest_spaceship = None
-
-        for other_hex in self.hex_map:
-            if other_hex["value"] == 3:
-                nearest_spaceship = other_hex
-
-        if nearest_spaceship is None:
-            return
-
-        if self.selected_planet["population"] >= amount:
-            self.selected_planet["population"] -= amount
-            nearest_spaceship["population"] += amount
+    def transfer_resource(self, resource, amount):
+        """Transfers a resource from the selected planet to the nearest spaceship"""
+        if self.selected_planet:
+            planet_cords = (self.selected_planet["q"], self.selected_planet["r"])
+            self.state.apply(("transfer", planet_cords, resource, amount))
+
+    def draw(self, screen, turn, alpha=1):
+        """Draws the map with moving objects alpha of the way from the previous simulation step to the latest one,
+        returns the list of changed screen rectangles"""
+        if not self.needs_redraw and not self.static_layer_dirty and not self.travel:
+            return []
+
+        # Restore the static layer under the previous overlays
+        if self.static_layer_dirty:
+            with profiler.scope("static_layer"):
+                self.build_static_layer(screen, turn)
+                screen.blit(self.static_layer, (0, 0))
+            dirty_rects = [screen.get_rect()]
         else:
-            amount = self.selected_planet["population"]
-            nearest_spaceship["population"] += amount
-            self.selected_planet["population"] = 0
+            for rect in self.overlay_rects:
+                screen.blit(self.static_layer, rect, rect)
+            dirty_rects = list(self.overlay_rects)
+
+        overlay_rects = []
 
-    def draw(self, screen, turn):
         # Draw info bar
-        self.draw_info_bar(screen, turn)
+        with profiler.scope("info_bar"):
+            overlay_rects.append(self.draw_info_bar(screen, turn))
 
-        # Draw hexes
-        for one_hex in self.hex_map:
-            self.draw_hex(screen, one_hex)
+        # Draw selected hexes
+        overlay_rects.extend(self.draw_selection(screen))
 
         # Draw possible movement
         if self.selected_spaceship:
-            self.draw_movement_area(screen)
+            overlay_rects.extend(self.draw_movement_area(screen))
+            if self.hover_path:
+                overlay_rects.append(self.draw_route(screen))
 
-        # Draw objects (sun и spaceship)
-        self.draw_hex_image(screen, 'sun', 2.5)
-        self.draw_hex_image(screen, 'spaceship', 1)
-        self.draw_hex_image(screen, 'transport_spaceship', 1)
+        # Draw objects (spaceship and transport)
+        with profiler.scope("hex_image"):
+            overlay_rects.extend(self.draw_hex_image(screen, 'spaceship', 1, alpha))
+            overlay_rects.extend(self.draw_hex_image(screen, 'transport_spaceship', 1))
 
         # Draw planet menu
         if self.planet_menu_active and self.selected_planet:
-            self.draw_planet_menu(screen)
+            with profiler.scope("planet_menu"):
+                overlay_rects.append(self.draw_planet_menu(screen))
 
         # Draw transport menu
         if self.transport_menu_active and self.selected_transport:
-            self.draw_transport_menu(screen)
+            with profiler.scope("transport_menu"):
+                overlay_rects.append(self.draw_transport_menu(screen))
+
+        self.overlay_rects = overlay_rects
+        self.needs_redraw = False
+        return dirty_rects + overlay_rects
 
     def draw_info_bar(self, screen, turn):
-        pygame.draw.rect(screen, settings.colors['black'], (0, 0, settings.width, settings.info_bar_height))
-        ship_population = sum(one_hex.get("population", 0) for one_hex in self.hex_map if one_hex.get("value") == 3)
-        ship_production = sum(one_hex.get("production", 0) for one_hex in self.hex_map)
-        ship_fuel = sum(one_hex.get("fuel", 0) for one_hex in self.hex_map)
+        """Draws the info bar and returns its rect"""
+        info_bar_rect = pygame.draw.rect(screen, settings.colors['black'],
+                                         (0, 0, settings.width, settings.info_bar_height))
+        spaceships = self.entities.get_all('spaceship')
+        ship_population = sum(one_hex["population"] for one_hex in spaceships)
+        ship_production = sum(one_hex["production"] for one_hex in spaceships)
+        ship_fuel = sum(one_hex["fuel"] for one_hex in spaceships)
 
         info_bar_x_offset = 5
         info_bar_y_offset = 5
 
         # Draw Population
-        population_icon = pygame.transform.scale(hex_images['population'], (settings.icon_size, settings.icon_size))
+        population_icon = get_scaled_image('population', (settings.icon_size, settings.icon_size))
         screen.blit(population_icon, (info_bar_x_offset, info_bar_y_offset))
-        population_text = self.font.render(f" {ship_population}", True, settings.colors['white'])
+        population_text = render_text(f" {ship_population}", settings.colors['white'])
         screen.blit(population_text, (info_bar_x_offset + settings.icon_size, info_bar_y_offset))
         info_bar_x_offset += settings.icon_size + population_text.get_width() + 10
 
         # Draw Production
-        production_icon = pygame.transform.scale(hex_images['production'], (settings.icon_size, settings.icon_size))
+        production_icon = get_scaled_image('production', (settings.icon_size, settings.icon_size))
         screen.blit(production_icon, (info_bar_x_offset, info_bar_y_offset))
-        production_text = self.font.render(f" {ship_production}", True, settings.colors['white'])
+        production_text = render_text(f" {ship_production}", settings.colors['white'])
         screen.blit(production_text, (info_bar_x_offset + settings.icon_size, info_bar_y_offset))
         info_bar_x_offset += settings.icon_size + production_text.get_width() + 10
 
         # Draw Power
-        power_icon = pygame.transform.scale(hex_images['fuel'], (settings.icon_size, settings.icon_size))
+        power_icon = get_scaled_image('fuel', (settings.icon_size, settings.icon_size))
         screen.blit(power_icon, (info_bar_x_offset, info_bar_y_offset))
-        power_text = self.font.render(f" {ship_fuel}", True, settings.colors['white'])
+        power_text = render_text(f" {ship_fuel}", settings.colors['white'])
         screen.blit(power_text, (info_bar_x_offset + settings.icon_size, info_bar_y_offset))
         info_bar_x_offset += settings.icon_size + power_text.get_width() + 10
 
         # Draw turn counter
-        turn_text = self.font.render(f"{turn.turn_count}/{turn.max_turns}", True, settings.colors['white'])
+        turn_text = render_text(f"{turn.turn_count}/{turn.max_turns}", settings.colors['white'])
         text_rect = turn_text.get_rect(topright=(settings.width - 10, settings.info_bar_height - 23))
         screen.blit(turn_text, text_rect)
+        return info_bar_rect.union(text_rect)
 
     def draw_hex(self, screen, one_hex):
-        hex_points = get_hex_points(one_hex["x"], one_hex["y"], settings.hex_radius)
-        width = 1
-
-        if self.selected_spaceship == one_hex:
-            color = settings.colors['red']
-            width = 3
-        elif self.selected_planet == one_hex or self.selected_transport == one_hex:
-            color = settings.colors['green']
-            width = 3
-        else:
-            color = settings.colors['white']
+        center = self.camera.world_to_screen(one_hex.x, one_hex.y)
+        hex_points = get_hex_points(*center, self.scale(settings.hex_radius))
+        pygame.draw.polygon(screen, settings.colors['white'], hex_points, 1)
 
-        pygame.draw.polygon(screen, color, hex_points, width)
-
-        if one_hex["value"] == 2:
+        if one_hex.value == 2:
             planet_type = one_hex.get('planet_type')
             planet_image_key = planet_types[planet_type]['image']
-            scaled_planet_image = pygame.transform.scale(hex_images[planet_image_key],
-                                                         (int(settings.hex_width) - settings.indent,
-                                                          int(settings.hex_width) - settings.indent))
-            screen.blit(scaled_planet_image, scaled_planet_image.get_rect(center=(one_hex["x"], one_hex["y"])))
+            planet_size = int(self.scale(int(settings.hex_width) - settings.indent))
+            scaled_planet_image = get_scaled_image(planet_image_key, (planet_size, planet_size))
+            screen.blit(scaled_planet_image, scaled_planet_image.get_rect(center=center))
+
+    def draw_selection(self, screen):
+        """Draws outlines of the selected hexes and returns their rects"""
+        rects = []
+        if self.selected_spaceship:
+            hex_points = get_hex_points(*self.to_screen(self.selected_spaceship), self.scale(settings.hex_radius))
+            rects.append(pygame.draw.polygon(screen, settings.colors['red'], hex_points, 3))
+        for one_hex in (self.selected_planet, self.selected_transport):
+            if one_hex and one_hex is not self.selected_spaceship:
+                hex_points = get_hex_points(*self.to_screen(one_hex), self.scale(settings.hex_radius))
+                rects.append(pygame.draw.polygon(screen, settings.colors['green'], hex_points, 3))
+        return rects
 
     def draw_movement_area(self, screen):
+        rects = []
+        radius = self.scale(settings.hex_radius)
         for one_hex in self.movement_hex:
-            hex_points = get_hex_points(one_hex["x"], one_hex["y"], settings.hex_radius)
-            pygame.draw.polygon(screen, settings.colors['blue'], hex_points, 3)
-
-    def draw_hex_image(self, screen, image, size):
-        scaled_image = pygame.transform.scale(hex_images[image],
-                                              (int(settings.hex_width) * size - settings.indent * size,
-                                               int(settings.hex_width) * size - settings.indent * size))
+            center = self.to_screen(one_hex)
+            if self.camera.is_visible(*center, radius):
+                rects.append(pygame.draw.polygon(screen, settings.colors['blue'], get_hex_points(*center, radius), 3))
+        return rects
+
+    def draw_route(self, screen):
+        """Draws the route from the selected spaceship to the hovered hexagon and returns its rect"""
+        points = [self.to_screen(one_hex) for one_hex in [self.selected_spaceship] + self.hover_path]
+        return pygame.draw.lines(screen, settings.colors['white'], False, points, settings.route_line_width)
+
+    def draw_hex_image(self, screen, image, size, alpha=1):
+        """Draws the object image and returns the rects it covers"""
+        rects = []
+        image_size = int(self.scale(int(settings.hex_width) * size - settings.indent * size))
+        scaled_image = get_scaled_image(image, (image_size, image_size))
         rect = scaled_image.get_rect()
 
-        # Draw sun with value 1 (Always in the center)
+        # Draw sun with value 1 (Always in the map center)
         if image == 'sun':
-            rect.center = (settings.width // 2, settings.height // 2)
-            screen.blit(scaled_image, rect)
-        # Draw spaceship with value 3
-        if image == 'spaceship':
-            for one_hex in self.hex_map:
-                if one_hex["value"] == 3:
-                    rect = scaled_image.get_rect(center=(one_hex["x"], one_hex["y"]))
-                    screen.blit(scaled_image, rect)
-                    break
-        # Draw transport_spaceship with value 4
-        if image == 'transport_spaceship':
-            for one_hex in self.hex_map:
-                if one_hex["value"] == 4:
-                    rect = scaled_image.get_rect(center=(one_hex["x"], one_hex["y"]))
-                    screen.blit(scaled_image, rect)
-                    break
+            rect.center = self.camera.world_to_screen(*self.center_cords)
+            rects.append(screen.blit(scaled_image, rect))
+        # Draw spaceships with value 3 and transport spaceships with value 4
+        if image in ('spaceship', 'transport_spaceship'):
+            for one_hex in self.entities.get_all(image):
+                if self.travel and one_hex is self.travel["hex"]:
+                    center = self.camera.world_to_screen(*self.get_travel_point(alpha))
+                else:
+                    center = self.to_screen(one_hex)
+                if self.camera.is_visible(*center, image_size):
+                    rect = scaled_image.get_rect(center=center)
+                    rects.append(screen.blit(scaled_image, rect))
+        return rects
 
     def draw_planet_menu(self, screen):
+        """Draws the planet menu and returns its rect"""
         # Draw menu background
         menu_x = settings.width // 2 - settings.menu_width // 2
         menu_y = settings.height // 2 - settings.menu_height // 2
         pygame.draw.rect(screen, settings.colors['black'], (menu_x, menu_y, settings.menu_width, settings.menu_height))
-        pygame.draw.rect(screen, settings.colors['white'],
-                         (menu_x - settings.menu_outline, menu_y - settings.menu_outline,
-                          settings.menu_width + settings.menu_outline * 2,
-                          settings.menu_height + settings.menu_outline * 2), settings.menu_outline)
+        menu_rect = pygame.draw.rect(screen, settings.colors['white'],
+                                     (menu_x - settings.menu_outline, menu_y - settings.menu_outline,
+                                      settings.menu_width + settings.menu_outline * 2,
+                                      settings.menu_height + settings.menu_outline * 2), settings.menu_outline)
 
         # Draw planet image area
         planet_area_x = menu_x + settings.menu_padding
@@ -426,9 +517,8 @@ class HexMap:
         # Draw planet image
         planet_type = self.selected_planet.get('planet_type')
         planet_image_key = planet_types[planet_type]['image']
-        planet_image = pygame.transform.scale(hex_images[planet_image_key],
-                                              (settings.planet_image_size - 2 * settings.menu_padding,
-                                               settings.planet_image_size - 2 * settings.menu_padding))
+        planet_image = get_scaled_image(planet_image_key, (settings.planet_image_size - 2 * settings.menu_padding,
+                                                           settings.planet_image_size - 2 * settings.menu_padding))
         screen.blit(planet_image, (planet_area_x + settings.menu_padding, planet_area_y + settings.menu_padding))
 
         stats_x = planet_area_x + settings.planet_image_size + settings.menu_padding
@@ -444,33 +534,33 @@ class HexMap:
                           settings.exit_button_size + settings.exit_btn_outline * 2,
                           settings.exit_button_size + settings.exit_btn_outline * 2),
                          settings.exit_btn_outline)
-        exit_text = self.font.render('X', True, settings.colors['white'])
+        exit_text = render_text('X', settings.colors['white'])
         screen.blit(exit_text, (button_x + 9, button_y + 7))
         self.exit_button_rect = pygame.Rect(button_x, button_y, settings.exit_button_size, settings.exit_button_size)
 
         if self.selected_planet["population"] > 0:
 
             # Icons
-            population_icon = pygame.transform.scale(hex_images['population'], (settings.menu_icon_size,
-                                                                                settings.menu_icon_size))
-            production_icon = pygame.transform.scale(hex_images['production'], (settings.menu_icon_size,
-                                                                                settings.menu_icon_size))
-            fuel_icon = pygame.transform.scale(hex_images['fuel'], (settings.menu_icon_size,
-                                                                    settings.menu_icon_size))
+            population_icon = get_scaled_image('population', (settings.menu_icon_size, settings.menu_icon_size))
+            production_icon = get_scaled_image('production', (settings.menu_icon_size, settings.menu_icon_size))
+            fuel_icon = get_scaled_image('fuel', (settings.menu_icon_size, settings.menu_icon_size))
 
             # Mini icons
-            mini_population_icon = pygame.transform.scale(hex_images['population'], (settings.resource_button_height,
-                                                                                     settings.resource_button_height))
-            mini_production_icon = pygame.transform.scale(hex_images['production'], (settings.resource_button_height,
-                                                                                     settings.resource_button_height))
-            mini_fuel_icon = pygame.transform.scale(hex_images['fuel'], (settings.resource_button_height,
-                                                                         settings.resource_button_height))
-
-            # Population
-            population_text = self.font.render(f"{self.selected_planet.get('population')}", True,
-                                               settings.colors['white'])
-            screen.blit(population_text, (stats_x, stats_y + (settings.menu_icon_size // 4)))
-            screen.blit(population_icon, (stats_x + population_text.get_width(), stats_y))
+            mini_population_icon = get_scaled_image('population', (settings.resource_button_height,
+                                                                   settings.resource_button_height))
+            mini_production_icon = get_scaled_image('production', (settings.resource_button_height,
+                                                                   settings.resource_button_height))
+            mini_fuel_icon = get_scaled_image('fuel', (settings.resource_button_height,
+                                                       settings.resource_button_height))
+
+            # Population and the stocks of production and fuel
+            stock_x = stats_x
+            for resource, icon in (('population', population_icon), ('production', production_icon),
+                                   ('fuel', fuel_icon)):
+                stock_text = render_text(f"{self.selected_planet.get(resource)}", settings.colors['white'])
+                screen.blit(stock_text, (stock_x, stats_y + (settings.menu_icon_size // 4)))
+                screen.blit(icon, (stock_x + stock_text.get_width(), stats_y))
+                stock_x += stock_text.get_width() + settings.menu_icon_size + settings.menu_padding
             stats_y += settings.menu_icon_size + settings.menu_padding
 
             # Specialization
@@ -484,7 +574,7 @@ class HexMap:
             elif specialization == "production":
                 specialization_icon = production_icon
 
-            specialization_text = self.font.render(f"Специализация:", True, settings.colors['white'])
+            specialization_text = render_text(f"Специализация:", settings.colors['white'])
             screen.blit(specialization_text, (stats_x, stats_y + (settings.menu_icon_size // 4)))
 
             if specialization_icon:
@@ -502,22 +592,17 @@ class HexMap:
             button_y = separator_y + settings.menu_padding
 
             # Are the buttons active depending on the specialization
-            fuel_100_active = False
-            population_100_active = False
-            production_100_active = False
-            fuel_10_active = False
-            population_10_active = False
-            production_10_active = False
-
-            if specialization and self.selected_planet.get('is_planet_active'):
-                fuel_100_active = specialization == "fuel"
-                population_100_active = specialization == "population"
-                production_100_active = specialization == "production"
-                fuel_10_active = specialization != "fuel"
-                population_10_active = specialization != "population"
-                production_10_active = specialization != "production"
-
-            specialize_buttons_active = self.can_specialize
+            fuel_amount = self.state.get_transfer_amount(self.selected_planet, "fuel")
+            population_amount = self.state.get_transfer_amount(self.selected_planet, "population")
+            production_amount = self.state.get_transfer_amount(self.selected_planet, "production")
+            fuel_100_active = fuel_amount == 100
+            population_100_active = population_amount == 100
+            production_100_active = production_amount == 100
+            fuel_10_active = fuel_amount == 10
+            population_10_active = population_amount == 10
+            production_10_active = production_amount == 10
+
+            specialize_buttons_active = self.state.can_specialize
 
             # Resources buttons row 1
             self.fuel_button_100_rect = self.draw_resource_button(screen, button_x, button_y, mini_fuel_icon, "+100",
@@ -595,6 +680,7 @@ class HexMap:
             self.specialize_production_rect = self.draw_specialization_button(screen, specialize_production_x,
                                                                               specialize_button_y, mini_production_icon,
                                                                               specialize_buttons_active)
+        return menu_rect
 
     def draw_resource_button(self, screen, x, y, icon, text, text_color, button_color, is_active):
         """Draws a resource button and returns its rect"""
@@ -602,7 +688,7 @@ class HexMap:
         pygame.draw.rect(screen, settings.colors['white'],
                          (x, y, settings.resource_button_width, settings.resource_button_height), 1)
 
-        text_surface = self.font.render(text, True, text_color)
+        text_surface = render_text(text, text_color)
         text_width, text_height = text_surface.get_size()
         icon_width, icon_height = icon.get_size()
         total_width = text_width + icon_width
@@ -631,14 +717,15 @@ class HexMap:
         return pygame.Rect(x, y, settings.resource_button_width, settings.resource_button_height) if is_active else None
 
     def draw_transport_menu(self, screen):
+        """Draws the transport menu and returns its rect"""
         # Draw menu background
         menu_x = settings.width // 2 - settings.menu_width // 2
         menu_y = settings.height // 2 - settings.menu_height // 2
         pygame.draw.rect(screen, settings.colors['black'], (menu_x, menu_y, settings.menu_width, settings.menu_height))
-        pygame.draw.rect(screen, settings.colors['white'],
-                         (menu_x - settings.menu_outline, menu_y - settings.menu_outline,
-                         settings.menu_width + settings.menu_outline * 2,
-                         settings.menu_height + settings.menu_outline * 2), settings.menu_outline)
+        menu_rect = pygame.draw.rect(screen, settings.colors['white'],
+                                     (menu_x - settings.menu_outline, menu_y - settings.menu_outline,
+                                      settings.menu_width + settings.menu_outline * 2,
+                                      settings.menu_height + settings.menu_outline * 2), settings.menu_outline)
 
         # Draw planet image area
         planet_area_x = menu_x + settings.menu_padding
@@ -647,18 +734,18 @@ class HexMap:
                                                             settings.planet_image_size, settings.planet_image_size), 2)
 
         # Draw planet image
-        transport_image = pygame.transform.scale(hex_images['transport_spaceship'],
-                                                 (settings.planet_image_size - 2 * settings.menu_padding,
-                                                  settings.planet_image_size - 2 * settings.menu_padding))
+        transport_image = get_scaled_image('transport_spaceship',
+                                           (settings.planet_image_size - 2 * settings.menu_padding,
+                                            settings.planet_image_size - 2 * settings.menu_padding))
         screen.blit(transport_image, (planet_area_x + settings.menu_padding, planet_area_y + settings.menu_padding))
 
         stats_x = planet_area_x + settings.planet_image_size + settings.menu_padding
         stats_y = planet_area_y
 
         # Population
-        pop_icon = pygame.transform.scale(hex_images['population'], (settings.menu_icon_size, settings.menu_icon_size))
+        pop_icon = get_scaled_image('population', (settings.menu_icon_size, settings.menu_icon_size))
         screen.blit(pop_icon, (stats_x, stats_y))
-        pop_text = self.font.render(f": {self.selected_transport.get('population')}", True, settings.colors['white'])
+        pop_text = render_text(f": {self.selected_transport.get('population')}", settings.colors['white'])
         screen.blit(pop_text, (stats_x + settings.menu_icon_size, stats_y + (settings.menu_icon_size // 4)))
         stats_y += settings.menu_icon_size + settings.menu_padding
 
@@ -677,13 +764,7 @@ class HexMap:
                          settings.exit_button_size + settings.exit_btn_outline * 2,
                          settings.exit_button_size + settings.exit_btn_outline * 2),
                          settings.exit_btn_outline)
-        exit_text = self.font.render('X', True, settings.colors['white'])
+        exit_text = render_text('X', settings.colors['white'])
         screen.blit(exit_text, (button_x + 9, button_y + 7))
         self.exit_button_rect = pygame.Rect(button_x, button_y, settings.exit_button_size, settings.exit_button_size)
-
-    def add_resource_to_spaceship(self, resource_type, amount):
-        """Adds resources to the nearest spaceship"""
-        for other_hex in self.hex_map:
-            if other_hex["value"] == 3:
-                if resource_type in other_hex:
-                    other_hex[resource_type] += amount
+        return menu_rect
@@ -0,0 +1,44 @@
+import time
+
+import pygame
+
+
+# Events after which the window content has to be drawn again
+expose_events = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+
+
+class IdleClock:
+    """Frame pacing for a turn-based game: full rate while something animates,
+    otherwise the loop sleeps in pygame.event.wait until input arrives or the idle timeout passes"""
+    def __init__(self, fps, idle_timeout=1000, enabled=True):
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.enabled = enabled
+        self.clock = pygame.time.Clock()
+        self.reset_stats()
+
+    def get_events(self, animating=False):
+        """Returns the events of the next frame, blocks while nothing animates"""
+        if self.enabled and not animating:
+            event = pygame.event.wait(self.idle_timeout)
+            events = [] if event.type == pygame.NOEVENT else [event]
+            events.extend(pygame.event.get())
+        else:
+            events = pygame.event.get()
+
+        # After a long wait this returns at once, bursts of input are still capped at fps
+        self.clock.tick(self.fps)
+        self.wakeups += 1
+        return events
+
+    def reset_stats(self):
+        self.wakeups = 0
+        self.stats_time = time.perf_counter()
+        self.stats_cpu_time = time.process_time()
+
+    def get_stats(self):
+        """Returns (CPU usage of one core from 0 to 1, wakeups per second) since reset_stats"""
+        elapsed = time.perf_counter() - self.stats_time
+        if elapsed <= 0:
+            return 0, 0
+        return (time.process_time() - self.stats_cpu_time) / elapsed, self.wakeups / elapsed
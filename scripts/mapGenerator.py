@@ -0,0 +1,122 @@
+import random
+
+from scripts.settings import settings
+from scripts.utils import hex_neighbor_coords, hex_ring_coords, hex_range_coords
+from scripts.constants import planet_types
+from scripts.hexCell import HexCell
+
+
+def build_hex_index(hex_map):
+    """Returns a dictionary of hexagons by their cords (q, r)"""
+    return {(one_hex.q, one_hex.r): one_hex for one_hex in hex_map}
+
+
+class MapGenerationError(Exception):
+    """The map constraints can not be met"""
+
+
+class CandidatePool:
+    """Hexagon cords available for placement, with O(1) random choice and removal"""
+    def __init__(self, coords):
+        self.coords = list(coords)
+        self.positions = {one_coords: i for i, one_coords in enumerate(self.coords)}
+
+    def __len__(self):
+        return len(self.coords)
+
+    def choice(self, rng):
+        return self.coords[rng.randrange(len(self.coords))]
+
+    def discard(self, one_coords):
+        position = self.positions.pop(one_coords, None)
+        if position is None:
+            return
+        last_coords = self.coords.pop()
+        if position < len(self.coords):
+            self.coords[position] = last_coords
+            self.positions[last_coords] = position
+
+    def discard_all(self, coords):
+        for one_coords in coords:
+            self.discard(one_coords)
+
+
+def generate_hex_map(center_coords, radius, seed=None):
+    """Generating a map and assigning values to hexagons, the same seed gives the same map.
+    Hexagon x and y are world pixels with the central hexagon at center_coords"""
+    rng = random.Random(seed)
+    hex_map = []
+
+    for map_q in range(-radius, radius + 1):
+        for map_r in range(max(-radius, -map_q - radius), min(radius, -map_q + radius) + 1):
+            x = center_coords[0] + (map_q * settings.x_offset) + (map_r * settings.x_offset / 2)
+            y = center_coords[1] + (map_r * settings.y_offset)
+            hex_map.append(HexCell(map_q, map_r, 0, x, y))
+
+    hex_index = build_hex_index(hex_map)
+
+    # Creating sun with value 1
+    for sun_hex_coords in hex_range_coords(0, 0, 1):
+        if sun_hex_coords in hex_index:
+            hex_index[sun_hex_coords]["value"] = 1
+
+    # Creating transport spaceship with value 4 on the border of the map
+    border_hexes = [hex_index[coords] for coords in hex_ring_coords(0, 0, radius)
+                    if coords in hex_index and hex_index[coords].value == 0]
+    if not border_hexes:
+        raise MapGenerationError(f"No border hexagons for the transport spaceship on a map of radius {radius}")
+    chosen_hex = rng.choice(border_hexes)
+    chosen_hex["value"] = 4
+    chosen_hex["population"] = 0
+    transport_spaceship_hex = chosen_hex
+
+    # Creating planets with value 2: at least 4 hexes from the transport spaceship,
+    # 3 from other planets and 2 from the sun
+    planet_types_list = list(planet_types.keys())
+    rng.shuffle(planet_types_list)
+    planet_count = rng.randint(5, 6)
+    total_population = 6000
+    population_options = [1100, 1200, 1300] if planet_count == 5 else [900, 1000, 1100]
+
+    candidates = CandidatePool((one_hex.q, one_hex.r) for one_hex in hex_map if one_hex.value == 0)
+    candidates.discard_all(hex_range_coords(0, 0, 2))
+    candidates.discard_all(hex_range_coords(transport_spaceship_hex["q"], transport_spaceship_hex["r"], 3))
+
+    planets = []
+    for i in range(planet_count):
+        if not candidates:
+            raise MapGenerationError(f"Only {i} of {planet_count} planets fit on a map of radius {radius}")
+        chosen_hex = hex_index[candidates.choice(rng)]
+        chosen_hex["value"] = 2
+        chosen_hex["planet_type"] = planet_types_list[i % len(planet_types_list)]
+        chosen_hex["specialization"] = None
+        chosen_hex["is_planet_active"] = True
+        chosen_hex["fuel"] = 100
+        chosen_hex["production"] = 100
+        planets.append(chosen_hex)
+        candidates.discard_all(hex_range_coords(chosen_hex["q"], chosen_hex["r"], 2))
+
+    # Every planet still to be assigned keeps at least the smallest option
+    assigned_population = 0
+    for i in range(len(planets) - 1):
+        planets_left = len(planets) - i - 1
+        pop = rng.choice([p for p in population_options
+                          if assigned_population + p + min(population_options) * planets_left <= total_population])
+        planets[i]["population"] = pop
+        assigned_population += pop
+
+    planets[-1]["population"] = total_population - assigned_population
+
+    # Creating spaceship with value 3 next to the transport spaceship
+    transport_neighbors = hex_neighbor_coords(transport_spaceship_hex["q"], transport_spaceship_hex["r"])
+    adjacent_hexes = [hex_index[coords] for coords in transport_neighbors
+                      if coords in hex_index and hex_index[coords]["value"] == 0]
+    if not adjacent_hexes:
+        raise MapGenerationError("No free hexagon next to the transport spaceship for the spaceship")
+    chosen_hex = rng.choice(adjacent_hexes)
+    chosen_hex["value"] = 3
+    chosen_hex["fuel"] = 100
+    chosen_hex["population"] = 0
+    chosen_hex["production"] = 0
+
+    return hex_map
@@ -0,0 +1,63 @@
+import heapq
+from bisect import bisect_right
+
+from scripts.utils import hex_neighbor_coords
+
+
+class DistanceField:
+    """Dijkstra from one hexagon: the cheapest cost and route to every empty hexagon it can reach
+
+    Routes go through empty hexagons only, the sun, planets and spaceships block them. The search stops at
+    max_cost, hexagons farther away are unknown. The field answers every destination at once,
+    so it is built once and kept until obstacles move."""
+    def __init__(self, hex_index, source, step_cost, max_cost=None):
+        self.source = source
+        self.max_cost = max_cost
+        self.costs = {source: 0}
+        self.previous = {source: None}
+
+        # Hexagons in the order they were settled, their costs never decrease
+        self.order = []
+        self.order_costs = []
+
+        queue = [(0, source)]
+        while queue:
+            cost, coords = heapq.heappop(queue)
+            if cost > self.costs[coords]:
+                continue
+            self.order.append(coords)
+            self.order_costs.append(cost)
+            for neighbor_coords in hex_neighbor_coords(*coords):
+                neighbor_hex = hex_index.get(neighbor_coords)
+                if neighbor_hex is None or neighbor_hex.value != 0:
+                    continue
+                new_cost = cost + step_cost
+                if max_cost is not None and new_cost > max_cost:
+                    continue
+                if new_cost < self.costs.get(neighbor_coords, new_cost + 1):
+                    self.costs[neighbor_coords] = new_cost
+                    self.previous[neighbor_coords] = coords
+                    heapq.heappush(queue, (new_cost, neighbor_coords))
+
+    def covers(self, max_cost):
+        """Whether every route up to max_cost is known"""
+        return self.max_cost is None or max_cost <= self.max_cost
+
+    def get_cost(self, coords):
+        """Returns the cost of the cheapest route to coords or None if there is no route within max_cost"""
+        return self.costs.get(coords)
+
+    def get_reachable(self, max_cost):
+        """Returns the cords of every hexagon reachable for at most max_cost, except the source"""
+        return self.order[1:bisect_right(self.order_costs, max_cost)]
+
+    def get_path(self, coords):
+        """Returns the route to coords without the source, empty if there is no route"""
+        if coords not in self.previous:
+            return []
+        path = []
+        while coords != self.source:
+            path.append(coords)
+            coords = self.previous[coords]
+        path.reverse()
+        return path
@@ -0,0 +1,46 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pygame
+
+
+class Preloader:
+    """Decodes images in a thread pool while the start screen runs"""
+    def __init__(self, resource_manager, names, workers=4):
+        self.resource_manager = resource_manager
+        self.names = [name for name in dict.fromkeys(names) if name not in resource_manager.loaded_images]
+        self.decoded = 0
+        self.lock = threading.Lock()
+
+        # Completed when every image is decoded
+        self.ready = Future()
+        if not self.names:
+            self.ready.set_result(None)
+
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Preloader")
+        self.futures = [self.executor.submit(self.decode, name) for name in self.names]
+        for future in self.futures:
+            future.add_done_callback(self.on_decoded)
+        self.executor.shutdown(wait=False)
+
+    @property
+    def progress(self):
+        """Share of decoded images from 0 to 1"""
+        return self.decoded / len(self.names) if self.names else 1
+
+    def decode(self, name):
+        # pygame releases the GIL while decoding, so the images are decoded in parallel
+        return name, pygame.image.load(os.path.join(self.resource_manager.images_dir, name))
+
+    def on_decoded(self, future):
+        with self.lock:
+            self.decoded += 1
+            if self.decoded == len(self.names):
+                self.ready.set_result(None)
+
+    def finish(self):
+        """Waits for the remaining images and hands them to the resource manager, call from the main thread"""
+        for future in self.futures:
+            name, image = future.result()
+            self.resource_manager.add_image(name, image)
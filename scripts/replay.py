@@ -0,0 +1,93 @@
+"""Plays a recorded session again from its command log
+
+Headless the commands are applied to the game state as fast as possible, with --render they are applied at the
+times they were recorded and the map is drawn. --turn jumps to the start of a turn without playing the turns before.
+
+Run from the project root: python -m scripts.replay data/saves/session.jsonl
+    --turn 10       start from this turn; headless, stop there
+    --render        draw the game and apply the commands at their recorded times
+    --speed 2       with --render, play this many times faster than recorded
+"""
+import argparse
+import os
+import time
+
+import pygame
+
+from scripts.commandLog import CommandLog, CommandLogError
+from scripts.constants import build_sprite_atlas, get_image, get_scaled_image
+from scripts.fixedTimestep import FixedTimestep
+from scripts.hexmap import HexMap
+from scripts.settings import settings
+from scripts.turnManager import TurnManager
+
+
+def replay_headless(command_log, turn=None):
+    """Returns the state after the commands, or at the start of the turn, and the number of commands applied"""
+    stop = len(command_log.commands) if turn is None else command_log.get_turn_index(turn)
+    return command_log.replay(stop=stop), stop
+
+
+def play(command_log, turn=0, speed=1):
+    """Draws the session from the start of the turn, commands are applied at their recorded times divided by speed.
+    Returns the final state or None when the window is closed"""
+    settings.init_display(get_image('icon'))
+    build_sprite_atlas()
+    start = command_log.get_turn_index(turn)
+    background = get_scaled_image('background', (settings.width, settings.height))
+    hex_map = HexMap(command_log.center_cords, command_log.radius, background,
+                     state=command_log.replay(stop=start), autosave=False)
+    turn_manager = TurnManager(hex_map.state)
+    timestep = FixedTimestep(settings.simulation_rate, settings.max_catch_up_steps)
+
+    commands = command_log.commands
+    start_seconds = commands[start][0] if start < len(commands) else 0
+    start_time = time.perf_counter()
+    index = start
+    while index < len(commands) or hex_map.is_animating():
+        # The loop keeps running between commands, so they are applied on time
+        for event in settings.clock.get_events(animating=True):
+            if event.type == pygame.QUIT:
+                return None
+            hex_map.handle_camera_input(event)
+
+        elapsed = (time.perf_counter() - start_time) * speed + start_seconds
+        while index < len(commands) and commands[index][0] <= elapsed:
+            if not hex_map.apply_command(commands[index][1]):
+                raise CommandLogError(f"Command {index} {commands[index][1]} did nothing, "
+                                      f"the replay went another way")
+            index += 1
+
+        alpha = timestep.advance(hex_map.simulate, active=hex_map.is_animating())
+        dirty_rects = hex_map.draw(settings.screen, turn_manager, alpha)
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+    return hex_map.state
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Plays a recorded session again")
+    parser.add_argument("log", nargs="?", default=os.path.join(settings.save_dir, "session.jsonl"))
+    parser.add_argument("--turn", type=int)
+    parser.add_argument("--render", action="store_true")
+    parser.add_argument("--speed", type=float, default=1)
+    args = parser.parse_args(args)
+
+    command_log = CommandLog.load(args.log)
+    if args.render:
+        state = play(command_log, args.turn or 0, args.speed)
+        if state is not None:
+            print(f"turn {state.turn_count}")
+        pygame.quit()
+        return
+
+    start = time.perf_counter()
+    state, count = replay_headless(command_log, args.turn)
+    elapsed = time.perf_counter() - start
+    print(f"commands {count}")
+    print(f"turn {state.turn_count}")
+    print(f"replay_time {elapsed:.6f}")
+
+
+if __name__ == "__main__":
+    main()
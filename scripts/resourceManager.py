@@ -1,7 +1,12 @@
 import os
 import sys
+from collections import OrderedDict
+
 import pygame
 
+from scripts.saveFormat import decode_map, import_json_map
+from scripts.spriteAtlas import SpriteAtlas
+
 
 def resource_path(relative_path):
     """Возвращает путь к файлу в .py и в .exe."""
@@ -11,33 +16,146 @@ def resource_path(relative_path):
 
 
 class ResourceManager:
-    def __init__(self, images_dir):
+    def __init__(self, images_dir, saves_dir=None, fonts_dir=None, scaled_cache_budget=32 * 1024 * 1024,
+                 text_cache_size=256):
         self.images_dir = resource_path(images_dir)
+        self.saves_dir = resource_path(saves_dir) if saves_dir else None
+        self.fonts_dir = resource_path(fonts_dir) if fonts_dir else None
         self.loaded_images = {}
+        self.display_format_images = set()
+
+        # Scaled copies of loaded images, oldest first: (name, size, smooth) -> surface
+        self.scaled_images = OrderedDict()
+        self.scaled_cache_budget = scaled_cache_budget
+        self.scaled_cache_bytes = 0
+
+        # Fonts by (name, size), name None is the pygame default font
+        self.loaded_fonts = {}
+
+        # Rendered text, oldest first: (font name, size, text, color) -> surface
+        self.text_surfaces = OrderedDict()
+        self.text_cache_size = text_cache_size
+
+        # Scaled copies packed into one surface, never evicted: (name, size, smooth) -> subsurface
+        self.atlas = None
+        self.atlas_images = {}
 
     def load_image(self, name, colorkey=None):
-        if name in self.loaded_images:
+        display_ready = pygame.display.get_surface() is not None
+        if name in self.loaded_images and (name in self.display_format_images or not display_ready):
             return self.loaded_images[name]
 
-        fullname = os.path.join(self.images_dir, name)
-        if not os.path.isfile(fullname):
-            print(f"Файл с изображением '{fullname}' не найден")
-            sys.exit()
-        image = pygame.image.load(fullname)
+        # Images loaded before the window exists are converted on the first request after it
+        image = self.loaded_images.get(name)
+        if image is None:
+            fullname = os.path.join(self.images_dir, name)
+            if not os.path.isfile(fullname):
+                print(f"Файл с изображением '{fullname}' не найден")
+                sys.exit()
+            image = pygame.image.load(fullname)
+
         if colorkey is not None:
             image = image.convert()
             if colorkey == -1:
                 colorkey = image.get_at((0, 0))
             image.set_colorkey(colorkey)
+        elif display_ready:
+            # Blits from the display pixel format need no conversion every frame
+            image = image.convert_alpha() if image.get_flags() & pygame.SRCALPHA else image.convert()
 
+        if display_ready:
+            self.display_format_images.add(name)
         self.loaded_images[name] = image
         return image
 
+    def add_image(self, name, image):
+        """Stores an image decoded elsewhere, it is converted to the display format on first use"""
+        if name not in self.loaded_images:
+            self.loaded_images[name] = image
+
+    def get_scaled_image(self, name, size, smooth=False):
+        """Returns the image scaled to size, scaling it only on the first request"""
+        size = (int(size[0]), int(size[1]))
+        key = (name, size, smooth)
+        if key in self.atlas_images:
+            return self.atlas_images[key]
+        if key in self.scaled_images:
+            self.scaled_images.move_to_end(key)
+            return self.scaled_images[key]
+
+        image = self.load_image(name)
+        if smooth:
+            scaled_image = pygame.transform.smoothscale(image, size)
+        else:
+            scaled_image = pygame.transform.scale(image, size)
+
+        self.scaled_images[key] = scaled_image
+        self.scaled_cache_bytes += self.surface_bytes(scaled_image)
+
+        # Drop the least recently used copies once the budget is exceeded
+        while self.scaled_cache_bytes > self.scaled_cache_budget and len(self.scaled_images) > 1:
+            _, old_image = self.scaled_images.popitem(last=False)
+            self.scaled_cache_bytes -= self.surface_bytes(old_image)
+        return scaled_image
+
+    def build_atlas(self, sprites):
+        """Packs scaled images (name, size, smooth) into one atlas, get_scaled_image then returns its parts"""
+        images = {}
+        for name, size, smooth in sprites:
+            key = (name, (int(size[0]), int(size[1])), smooth)
+            images[key] = self.get_scaled_image(*key)
+        self.atlas = SpriteAtlas(images)
+        self.atlas_images = {key: self.atlas.get(key) for key in images}
+        for key in images:
+            if key in self.scaled_images:
+                self.scaled_cache_bytes -= self.surface_bytes(self.scaled_images.pop(key))
+
+    def clear_scaled_images(self):
+        self.scaled_images.clear()
+        self.scaled_cache_bytes = 0
+
+    @staticmethod
+    def surface_bytes(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
     def load_sound(self, name):
         ...
 
     def load_font(self, name, size):
-        ...
+        key = (name, size)
+        if key in self.loaded_fonts:
+            return self.loaded_fonts[key]
+
+        fullname = None
+        if name is not None:
+            fullname = os.path.join(self.fonts_dir, name)
+            if not os.path.isfile(fullname):
+                print(f"Файл со шрифтом '{fullname}' не найден")
+                sys.exit()
+        font = pygame.font.Font(fullname, size)
+        self.loaded_fonts[key] = font
+        return font
+
+    def render_text(self, name, size, text, color):
+        """Returns the antialiased text surface, rendering it only when the text or color is new"""
+        key = (name, size, text, tuple(color))
+        if key in self.text_surfaces:
+            self.text_surfaces.move_to_end(key)
+            return self.text_surfaces[key]
+
+        text_surface = self.load_font(name, size).render(text, True, color)
+        self.text_surfaces[key] = text_surface
+        if len(self.text_surfaces) > self.text_cache_size:
+            self.text_surfaces.popitem(last=False)
+        return text_surface
 
     def load_saves(self, name):
-        ...
+        """Returns (hex_map, seed) for HexMap(saved_map=...) or None when there is no save; .json saves are imported"""
+        fullname = os.path.join(self.saves_dir, name)
+        if not os.path.isfile(fullname):
+            return None
+        if name.endswith(".json"):
+            with open(fullname, encoding="utf-8") as file:
+                return import_json_map(file)
+        with open(fullname, "rb") as file:
+            return decode_map(file.read())
@@ -0,0 +1,170 @@
+"""Binary map saves
+
+Layout, little-endian:
+    header         magic b"NOVA", version u16, cell count u32, seed i64 (-1 when unknown)
+    planet types   count u8, then every name as length u8 + utf-8
+    cell columns   q i16[], r i16[], value u8[], x f64[], y f64[]
+    planets        count u32, then q i16, r i16, type u8, specialization u8, active u8, population i32,
+                   fuel i32, production i32 (version 1 has no fuel and production)
+    spaceships     count u32, then q i16, r i16, fuel i32, population i32, production i32
+    transports     count u32, then q i16, r i16, population i32
+"""
+import json
+import struct
+import sys
+from array import array
+
+from scripts.hexCell import HexCell, snapshot_to_dict
+
+
+MAGIC = b"NOVA"
+VERSION = 2
+
+header_struct = struct.Struct("<4sHIq")
+count_struct = struct.Struct("<I")
+planet_struct = struct.Struct("<hhBBBiii")
+planet_struct_v1 = struct.Struct("<hhBBBi")
+spaceship_struct = struct.Struct("<hhiii")
+transport_struct = struct.Struct("<hhi")
+
+specializations = [None, "fuel", "population", "production"]
+
+
+class SaveFormatError(Exception):
+    """The file is not a map save this version can read"""
+
+
+def column_bytes(typecode, values):
+    column = array(typecode, values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+def read_column(typecode, data, offset, count):
+    column = array(typecode)
+    end = offset + column.itemsize * count
+    if end > len(data):
+        raise SaveFormatError("The save ends inside the cells")
+    column.frombytes(data[offset:end])
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column, end
+
+
+def encode_map(snapshot):
+    """Turns (seed, list of cell dictionaries) into the bytes of a binary save.
+    Planets of old JSON saves have no fuel and production, they are saved with none"""
+    seed, cells = snapshot
+    planets = [cell for cell in cells if cell["value"] == 2]
+    spaceships = [cell for cell in cells if cell["value"] == 3]
+    transports = [cell for cell in cells if cell["value"] == 4]
+    planet_type_names = sorted({cell["planet_type"] for cell in planets})
+    planet_type_ids = {name: i for i, name in enumerate(planet_type_names)}
+
+    parts = [header_struct.pack(MAGIC, VERSION, len(cells), -1 if seed is None else seed),
+             bytes([len(planet_type_names)])]
+    for name in planet_type_names:
+        encoded_name = name.encode("utf-8")
+        parts.append(bytes([len(encoded_name)]) + encoded_name)
+
+    parts.append(column_bytes("h", [cell["q"] for cell in cells]))
+    parts.append(column_bytes("h", [cell["r"] for cell in cells]))
+    parts.append(column_bytes("B", [cell["value"] for cell in cells]))
+    parts.append(column_bytes("d", [cell["x"] for cell in cells]))
+    parts.append(column_bytes("d", [cell["y"] for cell in cells]))
+
+    parts.append(count_struct.pack(len(planets)))
+    for cell in planets:
+        parts.append(planet_struct.pack(cell["q"], cell["r"], planet_type_ids[cell["planet_type"]],
+                                        specializations.index(cell["specialization"]),
+                                        cell["is_planet_active"], cell["population"],
+                                        cell.get("fuel", 0), cell.get("production", 0)))
+    parts.append(count_struct.pack(len(spaceships)))
+    for cell in spaceships:
+        parts.append(spaceship_struct.pack(cell["q"], cell["r"], cell["fuel"], cell["population"],
+                                           cell["production"]))
+    parts.append(count_struct.pack(len(transports)))
+    for cell in transports:
+        parts.append(transport_struct.pack(cell["q"], cell["r"], cell["population"]))
+    return b"".join(parts)
+
+
+def encode_map_snapshot(snapshot):
+    """Turns (seed, list of HexCell.snapshot()) into the bytes of a binary save, the dictionaries are built here,
+    in the save writer thread"""
+    seed, cells = snapshot
+    return encode_map((seed, [snapshot_to_dict(cell) for cell in cells]))
+
+
+def decode_map(data):
+    """Returns (list of HexCell, seed or None) from the bytes of a binary save"""
+    if len(data) < header_struct.size:
+        raise SaveFormatError("The save is too short")
+    magic, version, cell_count, seed = header_struct.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise SaveFormatError("The file is not a Nova Eclipse save")
+    if version not in (1, VERSION):
+        raise SaveFormatError(f"Unsupported save version {version}")
+    try:
+        return read_records(data, version, cell_count), None if seed == -1 else seed
+    except (struct.error, IndexError, KeyError, ValueError) as error:
+        # A truncated or damaged body fails somewhere in the records, callers get one error for all of it
+        raise SaveFormatError(f"The save is damaged: {error!r}") from error
+
+
+def read_records(data, version, cell_count):
+    """Returns the cells of the save body, the header is already checked"""
+    offset = header_struct.size
+
+    planet_type_names = []
+    type_count = data[offset]
+    offset += 1
+    for _ in range(type_count):
+        length = data[offset]
+        planet_type_names.append(data[offset + 1:offset + 1 + length].decode("utf-8"))
+        offset += 1 + length
+
+    q_column, offset = read_column("h", data, offset, cell_count)
+    r_column, offset = read_column("h", data, offset, cell_count)
+    value_column, offset = read_column("B", data, offset, cell_count)
+    x_column, offset = read_column("d", data, offset, cell_count)
+    y_column, offset = read_column("d", data, offset, cell_count)
+    hex_map = [HexCell(q, r, value, x, y) for q, r, value, x, y in zip(q_column, r_column, value_column,
+                                                                         x_column, y_column)]
+    hex_index = {(one_hex.q, one_hex.r): one_hex for one_hex in hex_map}
+
+    for record_struct, apply_record in ((planet_struct if version == VERSION else planet_struct_v1, apply_planet),
+                                        (spaceship_struct, apply_spaceship), (transport_struct, apply_transport)):
+        (count,) = count_struct.unpack_from(data, offset)
+        offset += count_struct.size
+        if offset + record_struct.size * count > len(data):
+            raise SaveFormatError("The save ends inside the records")
+        for record in record_struct.iter_unpack(data[offset:offset + record_struct.size * count]):
+            apply_record(hex_index[(record[0], record[1])], record, planet_type_names)
+        offset += record_struct.size * count
+
+    return hex_map
+
+
+def apply_planet(one_hex, record, planet_type_names):
+    _, _, type_id, specialization_id, is_active, population, *stocks = record
+    one_hex.planet_type = planet_type_names[type_id]
+    one_hex.specialization = specializations[specialization_id]
+    one_hex.is_planet_active = bool(is_active)
+    one_hex.population = population
+    if stocks:
+        one_hex.fuel, one_hex.production = stocks
+
+
+def apply_spaceship(one_hex, record, planet_type_names):
+    _, _, one_hex.fuel, one_hex.population, one_hex.production = record
+
+
+def apply_transport(one_hex, record, planet_type_names):
+    one_hex.population = record[2]
+
+
+def import_json_map(file):
+    """Reads an old JSON save, it has no seed"""
+    return [HexCell.from_dict(cell) for cell in json.load(file)], None
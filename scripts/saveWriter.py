@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+import threading
+
+
+def encode_json(snapshot):
+    return json.dumps(snapshot, indent=4).encode("utf-8")
+
+
+class SaveWriter:
+    """Writes saves in a background thread, only the latest snapshot of every file is written
+
+    Files that grow, like logs, get appended records instead: they are written in order after the latest snapshot"""
+    def __init__(self):
+        self.pending = {}
+        self.appends = {}
+        self.writing = False
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def save(self, file_path, snapshot, encode=encode_json):
+        """Queues the snapshot, it must not be changed after the call; encode turns it into bytes in the worker.
+        The snapshot replaces the whole file, records appended before it are dropped"""
+        with self.condition:
+            self.pending[file_path] = (snapshot, encode)
+            self.appends.pop(file_path, None)
+            self.start()
+
+    def append(self, file_path, record, encode=encode_json):
+        """Queues a record to be added to the end of the file after everything queued before it"""
+        with self.condition:
+            self.appends.setdefault(file_path, []).append((record, encode))
+            self.start()
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="SaveWriter", daemon=True)
+            self.thread.start()
+        self.condition.notify_all()
+
+    def flush(self, timeout=None):
+        """Waits until every queued snapshot is on disk, returns False on timeout"""
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.pending and not self.appends and not self.writing,
+                                           timeout)
+
+    def run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending or self.appends)
+                # A file with a new snapshot is written whole first, the records queued after it follow
+                file_path = next(iter(self.pending or self.appends))
+                pending = self.pending.pop(file_path, None)
+                records = self.appends.pop(file_path, [])
+                self.writing = True
+            try:
+                if pending is not None:
+                    snapshot, encode = pending
+                    self.write_atomic(file_path, encode(snapshot))
+                if records:
+                    with open(file_path, "ab") as file:
+                        file.write(b"".join(encode_record(record) for record, encode_record in records))
+            except Exception as error:
+                print(f"Не удалось сохранить '{file_path}': {error}")
+            finally:
+                with self.condition:
+                    self.writing = False
+                    self.condition.notify_all()
+
+    @staticmethod
+    def write_atomic(file_path, data):
+        """Writes into a temporary file next to the save and renames it, so the old save survives a crash"""
+        directory = os.path.dirname(file_path)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+
+save_writer = SaveWriter()
@@ -2,15 +2,27 @@ import math
 import os
 import pygame
 
-from scripts.resourceManager import ResourceManager
+from scripts.idleClock import IdleClock
 
 
 class GameSettings:
-    """Storing basic game settings and initializing Pygame"""
+    """Storing basic game settings and initializing Pygame on demand"""
     def __init__(self):
         self.width = 1000
         self.height = 750
         self.fps = 60
+        # Without animations the loop waits for input instead of ticking at fps, but wakes at least this often (ms)
+        self.idle_loop = True
+        self.idle_timeout = 1000
+        # Simulation steps per second, apart from the frame rate, and the most steps one frame can catch up
+        self.simulation_rate = 20
+        self.max_catch_up_steps = 5
+        # Computer player: thinking time per command in seconds, search processes (None for every core)
+        # and turns played ahead in every rollout
+        self.ai_player = False
+        self.ai_move_time = 0.5
+        self.ai_workers = None
+        self.ai_rollout_turns = 3
 
         # Colors
         self.colors = {
@@ -29,7 +41,12 @@ class GameSettings:
         self.x_offset = self.hex_width
         self.y_offset = self.hex_height * 3 / 4
         self.map_radius = 6
+        self.camera_pan_step = 100
         self.indent = 10
+        self.font_size = 30
+        self.title_font_size = 72
+        self.button_font_size = 36
+        self.profiler_font_size = 20
         self.info_bar_height = 30
         self.icon_size = 20
         self.menu_width = self.width // 2
@@ -40,6 +57,8 @@ class GameSettings:
         self.planet_image_size = 100
         self.menu_icon_size = 40
         self.menu_line_width = 2
+        self.route_line_width = 3
+        self.spaceship_speed = 8
         self.menu_padding = 10
         self.button_width = 150
         self.button_height = 40
@@ -47,20 +66,29 @@ class GameSettings:
         self.resource_button_width = 150
         self.resource_button_height = 30
         self.resource_button_padding = 15
+        self.progress_bar_width = 200
+        self.progress_bar_height = 6
 
         # Ways to files
         self.data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                      'data')
         self.images_dir = os.path.join(self.data_dir, 'images')
         self.save_dir = os.path.join(self.data_dir, 'saves')
+        self.fonts_dir = os.path.join(self.data_dir, 'fonts')
+        self.profile_path = os.path.join(self.data_dir, 'frame_profile.csv')
 
-        # Pygame initialization
+        # Created by init_display, the game rules do not need a window
+        self.screen = None
+        self.clock = None
+
+    def init_display(self, icon=None):
+        """Pygame initialization"""
         pygame.init()
         self.screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption("nova_eclipse")
-        resource_manager = ResourceManager(self.images_dir)
-        pygame.display.set_icon(resource_manager.load_image('icon_population.png'))
-        self.clock = pygame.time.Clock()
+        if icon is not None:
+            pygame.display.set_icon(icon)
+        self.clock = IdleClock(self.fps, self.idle_timeout, self.idle_loop)
 
 
 settings = GameSettings()
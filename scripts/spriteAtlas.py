@@ -0,0 +1,37 @@
+import pygame
+
+
+class SpriteAtlas:
+    """Packs small images into one display-format surface, every image becomes a named sub-rect of it"""
+    def __init__(self, images, max_width=1024, padding=1):
+        self.rects = {}
+
+        # Shelf packing: the tallest images first, rows from left to right
+        x, y, shelf_height, width = 0, 0, 0, 0
+        for name, image in sorted(images.items(), key=lambda item: item[1].get_height(), reverse=True):
+            image_width, image_height = image.get_size()
+            if x and x + image_width > max_width:
+                x, y, shelf_height = 0, y + shelf_height + padding, 0
+            self.rects[name] = pygame.Rect(x, y, image_width, image_height)
+            x += image_width + padding
+            shelf_height = max(shelf_height, image_height)
+            width = max(width, x)
+
+        self.surface = pygame.Surface((max(width, 1), max(y + shelf_height, 1)), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+        self.surface.fill((0, 0, 0, 0))
+        # An alpha blend onto transparent black would darken the half transparent edges,
+        # the maximum of every channel with zero copies the pixels as they are
+        for name, image in images.items():
+            self.surface.blit(image, self.rects[name], special_flags=pygame.BLEND_RGBA_MAX)
+
+    def __contains__(self, name):
+        return name in self.rects
+
+    def get(self, name):
+        """Returns the image as a subsurface sharing the atlas pixels"""
+        return self.surface.subsurface(self.rects[name])
+
+    def blit(self, screen, name, pos):
+        return screen.blit(self.surface, pos, self.rects[name])
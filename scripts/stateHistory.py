@@ -0,0 +1,110 @@
+# Everything a command can change in a hexagon, a missing optional field is stored as missing
+record_fields = ('value', 'fuel', 'population', 'production', 'planet_type', 'specialization', 'is_planet_active')
+missing = object()
+
+
+def get_record(one_hex):
+    return tuple(getattr(one_hex, key, missing) for key in record_fields)
+
+
+class Snapshot:
+    """The game state after a command: the hexagons in chunks of records and the turn counters
+
+    Chunks are tuples shared with the previous snapshot unless a hexagon in them changed,
+    so a snapshot costs a tuple of chunks plus the chunks of the changed hexagons."""
+    __slots__ = ('chunks', 'spaceships', 'moved_spaceships', 'turn_count', 'game_over', 'can_specialize',
+                 'turns_since_last_specialization')
+
+    def __init__(self, chunks, state):
+        self.chunks = chunks
+        # Spaceships move, the order of the registry decides the nearest one of equally distant spaceships
+        self.spaceships = tuple(state.entities.entities['spaceship'])
+        self.moved_spaceships = frozenset(state.moved_spaceships)
+        self.turn_count = state.turn_count
+        self.game_over = state.game_over
+        self.can_specialize = state.can_specialize
+        self.turns_since_last_specialization = state.turns_since_last_specialization
+
+
+class StateHistory:
+    """Snapshots of the game state at the start and after every command, for undo and rewind
+
+    Snapshot i is the state after i commands. The state reports the hexagons a command changed,
+    only their chunks are copied, so the memory grows with the changes and not with the map size."""
+    def __init__(self, state, chunk_size=32):
+        self.state = state
+        self.chunk_size = chunk_size
+        self.positions = {(one_hex.q, one_hex.r): i for i, one_hex in enumerate(state.hex_map)}
+        chunks = tuple(tuple(map(get_record, state.hex_map[i:i + chunk_size]))
+                       for i in range(0, len(state.hex_map), chunk_size))
+        self.snapshots = [Snapshot(chunks, state)]
+        state.history = self
+
+    def capture(self, changed_hexes):
+        """Takes the snapshot after a command that changed changed_hexes"""
+        chunks = list(self.snapshots[-1].chunks)
+        changed_chunks = {}
+        for one_hex in changed_hexes:
+            position = self.positions[(one_hex.q, one_hex.r)]
+            changed_chunks.setdefault(position // self.chunk_size, []).append(position)
+        for chunk_index, positions in changed_chunks.items():
+            chunk = list(chunks[chunk_index])
+            for position in positions:
+                chunk[position % self.chunk_size] = get_record(self.state.hex_map[position])
+            chunks[chunk_index] = tuple(chunk)
+        self.snapshots.append(Snapshot(tuple(chunks), self.state))
+
+    def restore(self, index):
+        """Returns the state to snapshot index and forgets the later ones, returns the number of undone commands
+
+        Only hexagons whose records are not shared between the snapshots are written back"""
+        current = self.snapshots[-1]
+        snapshot = self.snapshots[index]
+        for chunk_index, (chunk, current_chunk) in enumerate(zip(snapshot.chunks, current.chunks)):
+            if chunk is current_chunk:
+                continue
+            start = chunk_index * self.chunk_size
+            for position, (record, current_record) in enumerate(zip(chunk, current_chunk), start):
+                if record is current_record:
+                    continue
+                one_hex = self.state.hex_map[position]
+                for key, value in zip(record_fields, record):
+                    if value is not missing:
+                        setattr(one_hex, key, value)
+                    elif hasattr(one_hex, key):
+                        delattr(one_hex, key)
+
+        state = self.state
+        state.entities.entities['spaceship'] = {cords: state.hex_index[cords] for cords in snapshot.spaceships}
+        state.moved_spaceships = set(snapshot.moved_spaceships)
+        state.turn_count = snapshot.turn_count
+        state.game_over = snapshot.game_over
+        state.can_specialize = snapshot.can_specialize
+        state.turns_since_last_specialization = snapshot.turns_since_last_specialization
+        # Routes depend on where the spaceships are and how much fuel they have
+        state.distance_fields.clear()
+
+        undone = len(self.snapshots) - 1 - index
+        del self.snapshots[index + 1:]
+        return undone
+
+    def can_undo(self):
+        return len(self.snapshots) > 1
+
+    def undo(self, steps=1):
+        """Undoes the last steps commands, returns the number of undone commands"""
+        return self.restore(max(len(self.snapshots) - 1 - steps, 0))
+
+    def get_turn_index(self, turn):
+        """Returns the index of the snapshot at the start of the turn or None if the game has not reached it"""
+        for i, snapshot in enumerate(self.snapshots):
+            if snapshot.turn_count == turn:
+                return i
+        return None
+
+    def rewind(self, turn):
+        """Returns the game to the start of the turn, returns the number of undone commands"""
+        index = self.get_turn_index(turn)
+        if index is None:
+            return 0
+        return self.restore(index)
@@ -1,36 +1,38 @@
 import pygame
 
-from scripts.constants import hex_images
+from scripts.constants import get_scaled_image
 from scripts.settings import settings
 
 
 class TurnManager:
     """Control moves in the game"""
-    def __init__(self):
-        self.game_over = False
-        self.turn_count = 0
-        self.max_turns = 50
+    def __init__(self, state):
+        self.state = state
         self.turn_button_rect = pygame.Rect(settings.width - settings.turn_button_size,
                                             settings.height - settings.turn_button_size,
                                             settings.turn_button_size, settings.turn_button_size)
 
+    @property
+    def game_over(self):
+        return self.state.game_over
+
+    @property
+    def turn_count(self):
+        return self.state.turn_count
+
+    @property
+    def max_turns(self):
+        return self.state.max_turns
+
     def draw_turn_button(self, screen):
         """Draws the change move button"""
         screen.blit(
-            pygame.transform.scale(hex_images['next_turn'], (settings.turn_button_size, settings.turn_button_size)),
+            get_scaled_image('next_turn', (settings.turn_button_size, settings.turn_button_size)),
             self.turn_button_rect.topleft)
 
     def handle_input(self, event, hexmap):
-        """Changes the move and checks whether the game is finished"""
-        if ((event.type == pygame.MOUSEBUTTONDOWN and self.turn_button_rect.collidepoint(event.pos)) or
+        """Changes the move, the game state checks whether the game is finished"""
+        if ((event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and
+             self.turn_button_rect.collidepoint(event.pos)) or
            (event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE)):
-            for one_cell in hexmap.hex_map:
-                if one_cell["value"] == 3 and "fuel" in one_cell and one_cell['fuel'] <= 0:
-                    self.game_over = True
-            if self.turn_count >= self.max_turns:
-                self.game_over = True
-            self.turn_count += 1
-            hexmap.update()
-
-
-turn_manager = TurnManager()
+            hexmap.end_turn()
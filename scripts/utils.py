@@ -15,3 +15,66 @@ def hex_distance(hex1, hex2):
     """Calculates the distance between two hexagons with cords (q, r)"""
     return (abs(hex1["q"] - hex2["q"]) + abs(hex1["q"] + hex1["r"] - hex2["q"] - hex2["r"])
             + abs(hex1["r"] - hex2["r"])) // 2
+
+
+# Axial (q, r) offsets of the six neighbouring hexagons
+hex_directions = [(1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1)]
+
+
+def hex_neighbor_coords(q, r):
+    """Returns cords of the six hexagons around (q, r)"""
+    return [(q + dq, r + dr) for dq, dr in hex_directions]
+
+
+def hex_ring_coords(q, r, radius):
+    """Returns cords of the hexagons exactly radius steps away from (q, r)"""
+    if radius == 0:
+        return [(q, r)]
+    coords = []
+    ring_q, ring_r = q + hex_directions[4][0] * radius, r + hex_directions[4][1] * radius
+    for dq, dr in hex_directions:
+        for _ in range(radius):
+            coords.append((ring_q, ring_r))
+            ring_q, ring_r = ring_q + dq, ring_r + dr
+    return coords
+
+
+def hex_range_coords(q, r, radius):
+    """Returns cords of all hexagons at most radius steps away from (q, r)"""
+    coords = []
+    for dq in range(-radius, radius + 1):
+        for dr in range(max(-radius, -dq - radius), min(radius, -dq + radius) + 1):
+            coords.append((q + dq, r + dr))
+    return coords
+
+
+def hex_round(q, r):
+    """Rounds fractional axial cords to the nearest hexagon using cube cords"""
+    s = -q - r
+    round_q, round_r, round_s = round(q), round(r), round(s)
+    q_diff, r_diff, s_diff = abs(round_q - q), abs(round_r - r), abs(round_s - s)
+    if q_diff > r_diff and q_diff > s_diff:
+        round_q = -round_r - round_s
+    elif r_diff > s_diff:
+        round_r = -round_q - round_s
+    return round_q, round_r
+
+
+def pixel_to_hex_coords(x, y, center_coords, x_offset, y_offset):
+    """Converts a world point to axial cords (q, r) of the hexagon containing it"""
+    r = (y - center_coords[1]) / y_offset
+    q = (x - center_coords[0]) / x_offset - r / 2
+    return hex_round(q, r)
+
+
+def hex_coords_in_rect(left, top, right, bottom, center_coords, x_offset, y_offset):
+    """Returns axial cords of every hexagon with its center inside the world rectangle, row by row,
+    so the visible part of the map is found without looking at the rest of it"""
+    coords = []
+    r_min = math.ceil((top - center_coords[1]) / y_offset)
+    r_max = math.floor((bottom - center_coords[1]) / y_offset)
+    for r in range(r_min, r_max + 1):
+        q_min = math.ceil((left - center_coords[0]) / x_offset - r / 2)
+        q_max = math.floor((right - center_coords[0]) / x_offset - r / 2)
+        coords.extend((q, r) for q in range(q_min, q_max + 1))
+    return coords
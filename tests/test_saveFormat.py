@@ -0,0 +1,33 @@
+import unittest
+
+from benchmarks.save_format import make_snapshot
+from scripts.saveFormat import (SaveFormatError, count_struct, decode_map, encode_map, planet_struct,
+                                spaceship_struct, transport_struct)
+
+
+class DecodeMapTest(unittest.TestCase):
+    def test_round_trip(self):
+        seed, cells = make_snapshot(6)
+        hex_map, decoded_seed = decode_map(encode_map((seed, cells)))
+        self.assertEqual(decoded_seed, seed)
+        self.assertEqual([one_hex.to_dict() for one_hex in hex_map], cells)
+
+    def test_truncated_save(self):
+        data = encode_map(make_snapshot(6))
+        # Cut inside the planet types, the cell columns and every record section
+        for size in (21, 30, len(data) // 2, len(data) - 40, len(data) - 1):
+            with self.subTest(size=size), self.assertRaises(SaveFormatError):
+                decode_map(data[:size])
+
+    def test_damaged_planet_type(self):
+        data = bytearray(encode_map(make_snapshot(6)))
+        # The last planet record is followed by one spaceship and one transport, its type points past the types
+        offset = (len(data) - count_struct.size * 2 - spaceship_struct.size - transport_struct.size -
+                  planet_struct.size + 4)
+        data[offset] = 200
+        with self.assertRaises(SaveFormatError):
+            decode_map(bytes(data))
+
+
+if __name__ == "__main__":
+    unittest.main()